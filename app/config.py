@@ -3,7 +3,11 @@ Configuration management for the blog generator application.
 Loads environment variables and provides application settings.
 """
 
-from pydantic_settings import BaseSettings
+import os
+from functools import lru_cache, cached_property
+from typing import Optional
+from dotenv import dotenv_values
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import logging
 
 
@@ -11,29 +15,76 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Gemini Configuration
-    gemini_api_key: str = ""
     gemini_model: str = "gemini-3-flash-preview"
+    gemini_rpm: int = 20  # Requests per minute (free tier quota)
     
     # Application Settings
     app_env: str = "development"
     log_level: str = "INFO"
     max_content_length: int = 10000
     request_timeout: int = 30
+    url_validation_ttl: int = 300  # Seconds a successful URL validation is reused
+    response_cache_ttl: int = 3600  # Seconds generated blogs/extracted keywords are reused
+    max_workers: int = 8  # Threads for blocking/CPU-bound pipeline steps
+    nlp_workers: int = 0  # Processes for keyword/topic NLP (0 = use the thread pool)
+    job_concurrency: int = 4  # Background generation jobs running at once
+    max_pending_jobs: int = 64  # Queued + running jobs before submits get 429
+    max_download_bytes: int = 2_000_000  # Cap on fetched HTML per page (longer bodies are truncated)
+    max_page_bytes: int = 5_000_000  # Pages advertising a larger Content-Length are skipped
+    html_parser: str = "selectolax"  # "selectolax" or "beautifulsoup"
+    image_default_query: str = ""  # Unsplash query when no keywords ("" skips the search)
     
     # Model Settings
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_model_backend: str = "torch"  # "torch" or "onnx" (int8-quantized)
+    embedding_max_seq_length: int = 0  # Token cap per encoded text (0 = model's native limit)
     use_faiss_cache: bool = False
+    generative_cache_dir: str = "cache"  # Holds cache.faiss + cache.jsonl
+    generative_cache_threshold: float = 0.97  # Cosine similarity for a cache hit
     
-    # Unsplash API (for images)
-    unsplash_access_key: str = ""
+    # API keys (gemini_api_key, unsplash_access_key) are resolved lazily below,
+    # so they are allowed in the environment without being declared as fields
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    def _lookup_secret(self, name: str) -> str:
+        """
+        Resolve a secret from the environment, falling back to the .env file.
+        
+        Args:
+            name: Environment variable name (case-insensitive)
+            
+        Returns:
+            Secret value or empty string if not set
+        """
+        value: Optional[str] = os.environ.get(name.upper()) or os.environ.get(name.lower())
+        if value:
+            return value
+        
+        env_file = self.model_config.get("env_file")
+        if env_file and os.path.isfile(env_file):
+            for key, file_value in dotenv_values(env_file).items():
+                if key.lower() == name.lower() and file_value:
+                    return file_value
+        return ""
+    
+    @cached_property
+    def gemini_api_key(self) -> str:
+        """Gemini API key, resolved on first access."""
+        return self._lookup_secret("gemini_api_key")
+    
+    @cached_property
+    def unsplash_access_key(self) -> str:
+        """Unsplash API key (for images), resolved on first access."""
+        return self._lookup_secret("unsplash_access_key")
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings singleton."""
+    """
+    Get application settings singleton.
+    Environment and .env parsing happens once per process; later calls
+    return the cached instance.
+    """
     return Settings()
 
 
@@ -0,0 +1,127 @@
+"""
+Address Guard Module
+Resolves hostnames (with a short-lived cache) and rejects URLs whose host
+is not publicly routable, so user-supplied URLs cannot reach internal
+services (SSRF protection).
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+from typing import Iterable, Tuple
+from urllib.parse import urlsplit
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Resolved addresses per hostname, shared by the validator and the HTTP clients
+_dns_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_dns_cache_lock = threading.Lock()
+
+ALLOWED_SCHEMES = ('http', 'https')
+
+DNS_ERROR = "DNS resolution failed: Unable to resolve domain"
+NON_PUBLIC_ERROR = "URLs resolving to private or local addresses are not supported"
+
+
+class BlockedURLError(Exception):
+    """Raised when a fetch (or one of its redirects) targets a non-public URL."""
+
+
+def resolve_host(host: str) -> Tuple[str, ...]:
+    """
+    Resolve a hostname to its IP addresses (cached for a few minutes).
+    Blocking - use resolve_host_async from async code.
+
+    Args:
+        host: Hostname or IP literal
+
+    Returns:
+        Resolved IP address strings, in resolver order
+
+    Raises:
+        socket.gaierror: If the hostname cannot be resolved
+    """
+    with _dns_cache_lock:
+        addresses = _dns_cache.get(host)
+    if addresses is not None:
+        return addresses
+
+    addresses = tuple(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, None)))
+    with _dns_cache_lock:
+        _dns_cache[host] = addresses
+    return addresses
+
+
+async def resolve_host_async(host: str) -> Tuple[str, ...]:
+    """Async variant of resolve_host (getaddrinfo runs in a worker thread)."""
+    with _dns_cache_lock:
+        addresses = _dns_cache.get(host)
+    if addresses is not None:
+        return addresses
+    return await asyncio.to_thread(resolve_host, host)
+
+
+def check_public_addresses(addresses: Iterable[str]) -> Tuple[bool, str]:
+    """
+    Reject addresses that are private, loopback, link-local or otherwise
+    not publicly routable.
+
+    Args:
+        addresses: Resolved IP address strings
+
+    Returns:
+        Tuple of (is_public, error_message)
+    """
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global:
+            logger.warning("Rejected non-public address: %s", ip)
+            return False, NON_PUBLIC_ERROR
+    return True, ""
+
+
+def _split_target(url: str) -> Tuple[str, str]:
+    """Return (hostname, error_message) for a URL that may be fetched."""
+    parsed = urlsplit(url)
+    if parsed.scheme not in ALLOWED_SCHEMES:
+        return "", "URL must start with http:// or https://"
+    if not parsed.hostname:
+        return "", "Invalid URL: missing domain"
+    return parsed.hostname, ""
+
+
+def check_public_url(url: str) -> Tuple[bool, str]:
+    """
+    Check that a URL is http(s) and its host resolves only to public addresses.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        Tuple of (is_public, error_message)
+    """
+    host, error = _split_target(url)
+    if error:
+        return False, error
+    try:
+        addresses = resolve_host(host)
+    except (socket.gaierror, UnicodeError):
+        return False, DNS_ERROR
+    return check_public_addresses(addresses)
+
+
+async def check_public_url_async(url: str) -> Tuple[bool, str]:
+    """Async variant of check_public_url."""
+    host, error = _split_target(url)
+    if error:
+        return False, error
+    try:
+        addresses = await resolve_host_async(host)
+    except (socket.gaierror, UnicodeError):
+        return False, DNS_ERROR
+    return check_public_addresses(addresses)
@@ -4,20 +4,71 @@ Interfaces with Google Gemini API to generate blog content.
 Handles retry logic and response parsing.
 """
 
+import asyncio
 import logging
-import json
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, TypedDict
 from tenacity import retry, stop_after_attempt, wait_exponential
 import google.generativeai as genai
+import numpy as np
+import orjson
 from app.config import settings
+from app.core.generative_cache import get_generative_cache
+from app.core.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# JSON recovery helpers (built once)
+# Translation table: smart quotes -> straight quotes, control characters dropped
+_JSON_CLEAN_TABLE = str.maketrans({
+    '“': '"', '”': '"', '‘': "'", '’': "'",
+    **{chr(c): None for c in range(0x20)},
+    chr(0x7f): None,
+})
+_TRAIL_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class BlogSection(TypedDict):
+    """Response schema for a single blog section."""
+    heading: str
+    content: str
+
+
+class BlogSchema(TypedDict):
+    """Response schema enforced server-side by Gemini (JSON mode)."""
+    title: str
+    meta_description: str
+    introduction: str
+    sections: List[BlogSection]
+    conclusion: str
+    cta: str
+    tags: List[str]
+
+
+# Shared across all BlogGenerator instances so the quota is paced process-wide
+gemini_rate_limiter = RateLimiter(max_calls=settings.gemini_rpm, period=60.0)
+
 
 class BlogGenerator:
     """Generates blog content using Google Gemini API."""
     
+    # Gemini configuration for JSON output
+    # Use low temperature for more deterministic, JSON-friendly output;
+    # JSON mode + schema makes the model return structurally valid JSON
+    _GENERATION_CONFIG = {
+        "temperature": 0.0,
+        "top_p": 1.0,
+        "top_k": 0,
+        "max_output_tokens": 2500,
+        "response_mime_type": "application/json",
+        "response_schema": BlogSchema,
+    }
+    
+    # Prompt section (tone, word count, format) that must match exactly for a
+    # semantic cache hit; it can fall outside the embedding model's window
+    _CACHE_SCOPE_MARKER = "**BLOG REQUIREMENTS:**"
+    
     def __init__(self):
         """Initialize Gemini client."""
         if not settings.gemini_api_key:
@@ -44,18 +95,41 @@ class BlogGenerator:
             Generated text
         """
         try:
-            # Gemini configuration for JSON output
-            # Use low temperature for more deterministic, JSON-friendly output
-            generation_config = {
-                "temperature": 0.0,
-                "top_p": 1.0,
-                "top_k": 0,
-                "max_output_tokens": 2500,
-            }
-            
+            gemini_rate_limiter.acquire()
             response = self.gemini_model.generate_content(
                 prompt,
-                generation_config=generation_config
+                generation_config=self._GENERATION_CONFIG
+            )
+            
+            content = response.text
+            logger.info(f"Gemini API call successful")
+            
+            return content
+            
+        except Exception as e:
+            logger.error(f"Gemini API call failed: {str(e)}")
+            raise
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True
+    )
+    async def _call_gemini_async(self, prompt: str) -> str:
+        """
+        Call Google Gemini API asynchronously with retry logic.
+        
+        Args:
+            prompt: Input prompt
+            
+        Returns:
+            Generated text
+        """
+        try:
+            await gemini_rate_limiter.acquire_async()
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=self._GENERATION_CONFIG
             )
             
             content = response.text
@@ -70,7 +144,7 @@ class BlogGenerator:
     def parse_json_response(self, response: str) -> Dict:
         """
         Parse JSON response from LLM.
-        Handles markdown code blocks and malformed JSON.
+        Handles malformed JSON (JSON mode never wraps output in code fences).
         
         Args:
             response: Raw response from LLM
@@ -78,32 +152,20 @@ class BlogGenerator:
         Returns:
             Parsed JSON dictionary
         """
-        # Helper: try to json.loads and return None on failure
+        # Helper: try to parse (orjson, ~3x faster than stdlib json) and return None on failure
         def try_loads(text: str):
             try:
-                return json.loads(text)
-            except Exception:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
                 return None
 
-        # Strip common markdown code fences
-        if "```json" in response:
-            try:
-                response = response.split("```json", 1)[1].split("```", 1)[0]
-            except Exception:
-                pass
-        elif "```" in response:
-            try:
-                # take the first fenced block
-                response = response.split("```", 1)[1].split("```", 1)[0]
-            except Exception:
-                pass
-
         raw = response.strip()
 
-        # First quick attempt
-        data = try_loads(raw)
-        if data is not None:
-            return data
+        # Fast path: well-formed JSON needs no regex cleanup
+        if raw[:1] in ('{', '['):
+            data = try_loads(raw)
+            if data is not None:
+                return data
 
         # Attempt 2: extract first JSON object substring (from first '{' to last '}')
         first_brace = raw.find('{')
@@ -115,33 +177,44 @@ class BlogGenerator:
                 return data
 
         # Attempt 3: normalize smart quotes and remove trailing commas
-        cleaned = raw
-        # Replace smart quotes with straight quotes
-        cleaned = cleaned.replace('“', '"').replace('”', '"')
-        cleaned = cleaned.replace("‘", "'").replace("’", "'")
-
-        # Remove control characters that may break JSON (except newline)
-        cleaned = re.sub(r"[\x00-\x1f\x7f]", '', cleaned)
+        # Replace smart quotes and remove control characters that may break JSON
+        # in a single pass
+        cleaned = raw.translate(_JSON_CLEAN_TABLE)
 
         # Remove trailing commas before closing braces/brackets
-        cleaned = re.sub(r",\s*([}\]])", r"\1", cleaned)
+        cleaned = _TRAIL_COMMA_RE.sub(r"\1", cleaned)
 
         # Try loads again
         data = try_loads(cleaned)
         if data is not None:
             return data
 
-        # Attempt 4: try to find a JSON-like block with braces and balance them
-        # progressively expand from the first '{'
+        # Attempt 4: find the object closing the first '{' with a single
+        # left-to-right pass, tracking brace depth outside string literals
         if first_brace != -1:
-            for end in range(first_brace+1, min(len(raw), first_brace+20000)):
-                if raw[end] == '}':
-                    candidate = raw[first_brace:end+1]
-                    # quick check for balanced braces
-                    if candidate.count('{') == candidate.count('}'):
-                        data = try_loads(candidate)
+            depth = 0
+            in_string = False
+            escaped = False
+            for end in range(first_brace, len(raw)):
+                char = raw[end]
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        data = try_loads(raw[first_brace:end+1])
                         if data is not None:
                             return data
+                        break
 
         # All attempts failed - log helpful debug info
         logger.error("Failed to parse JSON response: all recovery attempts failed")
@@ -154,29 +227,76 @@ class BlogGenerator:
         matching our schema. Returns the raw text the model produced (should be JSON).
         """
         try:
-            repair_prompt = (
-                "The previous output was not valid JSON.\n"
-                "Below is the original output. Convert it into a single, valid JSON object that matches this schema:\n"
-                "{\n"
-                "  \"title\": string,\n"
-                "  \"meta_description\": string,\n"
-                "  \"introduction\": string,\n"
-                "  \"sections\": [ { \"heading\": string, \"content\": string } ],\n"
-                "  \"conclusion\": string,\n"
-                "  \"cta\": string,\n"
-                "  \"tags\": [string]\n"
-            "}\n"
-                "Return ONLY the valid JSON object, with straight quotes, no trailing commas, and no additional text.\n\n"
-                "ORIGINAL OUTPUT:\n" + raw_response
-            )
-
-            repair_resp = self._call_gemini(repair_prompt)
+            repair_resp = self._call_gemini(self._build_repair_prompt(raw_response))
             logger.info("Requested LLM to reformat output into valid JSON")
             return repair_resp
         except Exception as e:
             logger.error(f"Reformatting request failed: {str(e)}")
             raise
     
+    async def _reformat_to_json_async(self, raw_response: str) -> str:
+        """Async variant of _reformat_to_json."""
+        try:
+            repair_resp = await self._call_gemini_async(self._build_repair_prompt(raw_response))
+            logger.info("Requested LLM to reformat output into valid JSON")
+            return repair_resp
+        except Exception as e:
+            logger.error(f"Reformatting request failed: {str(e)}")
+            raise
+    
+    def _build_repair_prompt(self, raw_response: str) -> str:
+        """Build the prompt asking the LLM to convert malformed output into valid JSON."""
+        return (
+            "The previous output was not valid JSON.\n"
+            "Below is the original output. Convert it into a single, valid JSON object that matches this schema:\n"
+            "{\n"
+            "  \"title\": string,\n"
+            "  \"meta_description\": string,\n"
+            "  \"introduction\": string,\n"
+            "  \"sections\": [ { \"heading\": string, \"content\": string } ],\n"
+            "  \"conclusion\": string,\n"
+            "  \"cta\": string,\n"
+            "  \"tags\": [string]\n"
+            "}\n"
+            "Return ONLY the valid JSON object, with straight quotes, no trailing commas, and no additional text.\n\n"
+            "ORIGINAL OUTPUT:\n" + raw_response
+        )
+    
+    def _cache_scope(self, prompt: str) -> str:
+        """Get the part of the prompt that must match exactly for a cache hit."""
+        start = prompt.find(self._CACHE_SCOPE_MARKER)
+        return prompt[start:] if start != -1 else ""
+    
+    def _cache_lookup(self, prompt: str) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """
+        Look up a previously generated blog for a similar prompt.
+        
+        Args:
+            prompt: Structured prompt for blog generation
+            
+        Returns:
+            Tuple of (cached blog data or None, prompt embedding or None if caching is disabled)
+        """
+        cache = get_generative_cache()
+        if cache is None:
+            return None, None
+        
+        embedding = cache.embed(prompt)
+        cached = cache.lookup(embedding, self._cache_scope(prompt))
+        if cached is None:
+            return None, embedding
+        return self.parse_json_response(cached), embedding
+    
+    def _cache_store(self, prompt: str, embedding: Optional[np.ndarray], blog_data: Dict):
+        """Store a successfully parsed blog in the generative cache."""
+        if embedding is None:
+            return
+        get_generative_cache().add(
+            embedding,
+            orjson.dumps(blog_data).decode('utf-8'),
+            self._cache_scope(prompt)
+        )
+    
     def generate(self, prompt: str) -> Dict:
         """
         Generate blog content from prompt.
@@ -191,6 +311,11 @@ class BlogGenerator:
             ValueError: If generation or parsing fails
         """
         try:
+            # Reuse the response for a semantically identical prompt
+            cached, embedding = self._cache_lookup(prompt)
+            if cached is not None:
+                return cached
+            
             # Call Gemini API
             response = self._call_gemini(prompt)
             
@@ -203,6 +328,44 @@ class BlogGenerator:
                 repaired = self._reformat_to_json(response)
                 blog_data = self.parse_json_response(repaired)
             
+            self._cache_store(prompt, embedding, blog_data)
+            logger.info("Blog generation successful")
+            return blog_data
+            
+        except Exception as e:
+            logger.error(f"Blog generation failed: {str(e)}")
+            raise
+    
+    async def generate_async(self, prompt: str) -> Dict:
+        """
+        Async variant of generate.
+        Awaits Gemini without blocking the event loop.
+        
+        Args:
+            prompt: Structured prompt for blog generation
+            
+        Returns:
+            Dictionary with blog content structure
+            
+        Raises:
+            ValueError: If generation or parsing fails
+        """
+        try:
+            # Embedding the prompt is CPU-bound, keep it off the event loop
+            cached, embedding = await asyncio.to_thread(self._cache_lookup, prompt)
+            if cached is not None:
+                return cached
+            
+            response = await self._call_gemini_async(prompt)
+            
+            try:
+                blog_data = self.parse_json_response(response)
+            except ValueError:
+                logger.warning("Initial parse failed - attempting to ask LLM to reformat its output into valid JSON")
+                repaired = await self._reformat_to_json_async(response)
+                blog_data = self.parse_json_response(repaired)
+            
+            await asyncio.to_thread(self._cache_store, prompt, embedding, blog_data)
             logger.info("Blog generation successful")
             return blog_data
             
@@ -231,6 +394,12 @@ class BlogGenerator:
         return total_cost
 
 
+@lru_cache(maxsize=1)
+def _get_blog_generator() -> BlogGenerator:
+    """Get the shared BlogGenerator instance (created on first use)."""
+    return BlogGenerator()
+
+
 # Convenience function
 def generate_blog(prompt: str) -> Dict:
     """
@@ -242,5 +411,4 @@ def generate_blog(prompt: str) -> Dict:
     Returns:
         Blog content dictionary
     """
-    generator = BlogGenerator()
-    return generator.generate(prompt)
+    return _get_blog_generator().generate(prompt)
@@ -1,149 +1,350 @@
 """
 Content Extractor Module
-Extracts main textual content from web pages using BeautifulSoup and newspaper3k.
+Extracts main textual content from web pages using trafilatura and selectolax/BeautifulSoup.
 Focuses on article content while filtering out navigation, ads, and boilerplate.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict
-import requests
+from functools import lru_cache
+from typing import Optional, Dict, Iterable, Iterator, Tuple
+from urllib.parse import urlparse
+import trafilatura
 from bs4 import BeautifulSoup
-from newspaper import Article
+from selectolax.parser import HTMLParser
 from app.config import settings
+from app.core.http_client import stream_public, stream_public_async
 
 logger = logging.getLogger(__name__)
 
+# Boilerplate elements stripped before text extraction
+UNWANTED_TAGS = ['script', 'style', 'nav', 'header', 'footer',
+                 'aside', 'form', 'iframe', 'noscript']
+
+# URL path extensions that never point to an article page
+NON_HTML_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.mp3', '.mp4',
+    '.avi', '.mov', '.zip', '.gz', '.tar', '.exe', '.doc', '.docx', '.xls',
+    '.xlsx', '.ppt', '.pptx', '.json', '.xml', '.csv'
+)
+
+# Elements whose text makes up the extracted content
+TEXT_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'li'}
+
 
 class ContentExtractor:
-    """Extracts meaningful content from web pages."""
+    """
+    Extracts meaningful content from web pages.
+    
+    Holds only configuration: __slots__ prevents new attributes and nothing
+    is reassigned after __init__, so one instance is shared by concurrent
+    requests and worker threads without locking.
+    """
+    
+    __slots__ = ('timeout', 'max_length', 'html_parser', 'max_download_bytes', 'max_page_bytes', 'headers')
     
     def __init__(self):
         self.timeout = settings.request_timeout
         self.max_length = settings.max_content_length
+        self.html_parser = settings.html_parser
+        self.max_download_bytes = settings.max_download_bytes
+        self.max_page_bytes = settings.max_page_bytes
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate'
+        }
+    
+    def _fetch_html(self, url: str) -> Optional[bytes]:
+        """
+        Download page HTML once for all extractors.
+        Streamed, so oversized bodies are never fully downloaded. The fetch
+        only connects to public addresses, including on redirects.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Raw page HTML (capped at max_download_bytes) or None
+        """
+        try:
+            # Redirects are followed by hand; every hop must be a public address
+            with stream_public(str(url), timeout=self.timeout, headers=self.headers) as response:
+                response.raise_for_status()
+                if not self._is_html(response.headers) or self._too_large(response.headers):
+                    return None
+                
+                body = bytearray()
+                for chunk in response.iter_bytes(chunk_size=65536):
+                    body += chunk
+                    if len(body) >= self.max_download_bytes:
+                        logger.info(f"Truncating download at {self.max_download_bytes} bytes")
+                        break
+            
+            return bytes(body)
+            
+        except Exception as e:
+            logger.warning(f"Page download failed: {str(e)}")
+            return None
+    
+    async def _fetch_html_async(self, url: str) -> Optional[bytes]:
+        """
+        Async variant of _fetch_html.
+        Fetches the page without blocking the event loop.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Raw page HTML (capped at max_download_bytes) or None
+        """
+        try:
+            async with stream_public_async(str(url), timeout=self.timeout, headers=self.headers) as response:
+                response.raise_for_status()
+                if not self._is_html(response.headers) or self._too_large(response.headers):
+                    return None
+                
+                body = bytearray()
+                async for chunk in response.aiter_bytes(chunk_size=65536):
+                    body += chunk
+                    if len(body) >= self.max_download_bytes:
+                        logger.info(f"Truncating download at {self.max_download_bytes} bytes")
+                        break
+            
+            return bytes(body)
+            
+        except Exception as e:
+            logger.warning(f"Page download failed: {str(e)}")
+            return None
     
-    def extract_with_newspaper(self, url: str) -> Optional[Dict[str, str]]:
+    def extract_with_trafilatura(self, html: bytes) -> Optional[Dict[str, str]]:
         """
-        Extract content using newspaper3k library.
+        Extract content using trafilatura.
         Best for article-style content and blogs.
         
         Args:
-            url: URL to extract content from
+            html: Raw page HTML
             
         Returns:
             Dictionary with extracted content or None
         """
         try:
-            article = Article(str(url))
-            article.download()
-            article.parse()
+            article = trafilatura.bare_extraction(
+                html,
+                include_comments=False,
+                favor_precision=True,
+                with_metadata=True
+            )
+            if not article or not article.get('text'):
+                return None
             
             # Extract metadata
             content = {
-                'title': article.title or '',
-                'text': article.text or '',
-                'authors': article.authors,
-                'publish_date': str(article.publish_date) if article.publish_date else None,
-                'top_image': article.top_image or '',
-                'meta_description': article.meta_description or '',
-                'meta_keywords': article.meta_keywords,
+                'title': article.get('title') or '',
+                'text': article['text'],
+                'authors': [a.strip() for a in (article.get('author') or '').split(';') if a.strip()],
+                'publish_date': article.get('date'),
+                'top_image': article.get('image') or '',
+                'meta_description': article.get('description') or '',
+                'meta_keywords': [k.strip() for tag in (article.get('tags') or [])
+                                  for k in tag.split(',') if k.strip()],
             }
             
-            if content['text']:
-                logger.info(f"Successfully extracted content using newspaper3k: {len(content['text'])} chars")
-                return content
+            logger.info(f"Successfully extracted content using trafilatura: {len(content['text'])} chars")
+            return content
             
+        except Exception as e:
+            logger.warning(f"Trafilatura extraction failed: {str(e)}")
             return None
+    
+    def _extract_from_html(self, html: Optional[bytes]) -> Optional[Dict[str, str]]:
+        """
+        Run the extractors over downloaded HTML.
+        Tries trafilatura first, falls back to the plain HTML parser.
+        
+        Args:
+            html: Raw page HTML or None if the download failed
             
-        except Exception as e:
-            logger.warning(f"Newspaper extraction failed: {str(e)}")
+        Returns:
+            Dictionary with extracted content or None
+        """
+        if not html:
             return None
+        
+        # Try trafilatura first (better for articles)
+        content = self.extract_with_trafilatura(html)
+        
+        # Fallback to selectolax/BeautifulSoup
+        if not content:
+            content = self._parse_html(html)
+        
+        return content
     
-    def extract_with_beautifulsoup(self, url: str) -> Optional[Dict[str, str]]:
+    def _is_html(self, headers) -> bool:
+        """Check the response Content-Type before downloading the body."""
+        content_type = headers.get('Content-Type', '').lower()
+        if content_type and 'html' not in content_type:
+            logger.warning(f"Skipping non-HTML response: {content_type}")
+            return False
+        return True
+    
+    def _too_large(self, headers) -> bool:
+        """Check the advertised Content-Length against max_page_bytes."""
+        content_length = headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > self.max_page_bytes:
+            logger.warning(f"Skipping page larger than {self.max_page_bytes} bytes: {content_length}")
+            return True
+        return False
+    
+    def _parse_html(self, html: bytes) -> Optional[Dict[str, str]]:
         """
-        Extract content using BeautifulSoup.
-        More flexible, works for various page types.
+        Parse fetched HTML into the extracted content dictionary.
+        Uses selectolax (C parser) unless the BeautifulSoup parser is configured.
         
         Args:
-            url: URL to extract content from
+            html: Raw page HTML
             
         Returns:
             Dictionary with extracted content or None
         """
-        try:
-            # Fetch page
-            response = requests.get(
-                str(url),
-                timeout=self.timeout,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 
-                                'aside', 'form', 'iframe', 'noscript']):
-                element.decompose()
-            
-            # Extract title
-            title = ''
-            if soup.title:
-                title = soup.title.string or ''
-            elif soup.find('h1'):
-                title = soup.find('h1').get_text(strip=True)
-            
-            # Extract meta description
-            meta_desc = ''
-            meta_tag = soup.find('meta', attrs={'name': 'description'})
-            if meta_tag and meta_tag.get('content'):
-                meta_desc = meta_tag['content']
-            
-            # Extract main content
-            # Priority: article, main, div with specific classes
-            main_content = None
-            for tag in ['article', 'main', ['div', {'class': ['content', 'post', 'entry']}]]:
-                if isinstance(tag, list):
-                    main_content = soup.find(tag[0], tag[1])
-                else:
-                    main_content = soup.find(tag)
-                if main_content:
-                    break
-            
-            # Fallback to body
-            if not main_content:
-                main_content = soup.find('body')
+        if self.html_parser == 'beautifulsoup':
+            title, meta_desc, text = self._parse_with_beautifulsoup(html)
+        else:
+            title, meta_desc, text = self._parse_with_selectolax(html)
+        
+        if text:
+            logger.info(f"Successfully extracted content using {self.html_parser}: {len(text)} chars")
+            return {
+                'title': title,
+                'text': text,
+                'meta_description': meta_desc,
+                'authors': [],
+                'publish_date': None,
+                'top_image': '',
+                'meta_keywords': [],
+            }
+        
+        return None
+    
+    def _take_chars(self, paragraphs: Iterable[str]) -> Iterator[str]:
+        """
+        Yield paragraphs until the joined text reaches max_length.
+        Huge pages stop being collected mid-stream instead of being joined
+        in full and truncated afterwards (_finalize trims the overshoot).
+        
+        Args:
+            paragraphs: Non-empty paragraph texts in document order
             
-            if main_content:
-                # Extract paragraphs
-                paragraphs = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'li'])
-                text = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                
-                content = {
-                    'title': title,
-                    'text': text,
-                    'meta_description': meta_desc,
-                    'authors': [],
-                    'publish_date': None,
-                    'top_image': '',
-                    'meta_keywords': [],
-                }
-                
-                if text:
-                    logger.info(f"Successfully extracted content using BeautifulSoup: {len(text)} chars")
-                    return content
+        Yields:
+            Paragraph texts
+        """
+        remaining = self.max_length
+        for paragraph in paragraphs:
+            yield paragraph
+            remaining -= len(paragraph) + 1
+            if remaining <= 0:
+                break
+    
+    def _parse_with_selectolax(self, html: bytes) -> Tuple[str, str, str]:
+        """
+        Extract title, meta description and main text using selectolax.
+        
+        Args:
+            html: Raw page HTML
             
-            return None
+        Returns:
+            Tuple of (title, meta_description, text)
+        """
+        tree = HTMLParser(html)
+        
+        # Remove unwanted elements
+        for node in tree.css(','.join(UNWANTED_TAGS)):
+            node.decompose()
+        
+        # Extract title
+        title = ''
+        title_node = tree.css_first('title') or tree.css_first('h1')
+        if title_node:
+            title = title_node.text(strip=True)
+        
+        # Extract meta description
+        meta_desc = ''
+        meta_node = tree.css_first('meta[name="description"]')
+        if meta_node:
+            meta_desc = meta_node.attributes.get('content') or ''
+        
+        # Extract main content
+        # Priority: article, main, div with specific classes, body
+        main_content = None
+        for selector in ['article', 'main', 'div.content, div.post, div.entry', 'body']:
+            main_content = tree.css_first(selector)
+            if main_content:
+                break
+        
+        text = ''
+        if main_content:
+            # Extract paragraphs (document order, like BeautifulSoup's find_all)
+            paragraphs = (node.text(strip=True) for node in main_content.traverse()
+                          if node.tag in TEXT_TAGS)
+            text = '\n'.join(self._take_chars(p for p in paragraphs if p))
+        
+        return title, meta_desc, text
+    
+    def _parse_with_beautifulsoup(self, html: bytes) -> Tuple[str, str, str]:
+        """
+        Extract title, meta description and main text using BeautifulSoup.
+        
+        Args:
+            html: Raw page HTML
             
-        except Exception as e:
-            logger.warning(f"BeautifulSoup extraction failed: {str(e)}")
-            return None
+        Returns:
+            Tuple of (title, meta_description, text)
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        
+        # Remove unwanted elements
+        for element in soup(UNWANTED_TAGS):
+            element.decompose()
+        
+        # Extract title
+        title = ''
+        if soup.title:
+            title = soup.title.string or ''
+        elif soup.find('h1'):
+            title = soup.find('h1').get_text(strip=True)
+        
+        # Extract meta description
+        meta_desc = ''
+        meta_tag = soup.find('meta', attrs={'name': 'description'})
+        if meta_tag and meta_tag.get('content'):
+            meta_desc = meta_tag['content']
+        
+        # Extract main content
+        # Priority: article, main, div with specific classes
+        main_content = None
+        for tag in ['article', 'main', ['div', {'class': ['content', 'post', 'entry']}]]:
+            if isinstance(tag, list):
+                main_content = soup.find(tag[0], tag[1])
+            else:
+                main_content = soup.find(tag)
+            if main_content:
+                break
+        
+        # Fallback to body
+        if not main_content:
+            main_content = soup.find('body')
+        
+        text = ''
+        if main_content:
+            # Extract paragraphs
+            paragraphs = (p.get_text(strip=True) for p in main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'li']))
+            text = '\n'.join(self._take_chars(p for p in paragraphs if p))
+        
+        return title, meta_desc, text
     
     def extract(self, url: str) -> Dict[str, str]:
         """
         Extract content from URL using multiple methods.
-        Tries newspaper3k first, falls back to BeautifulSoup.
+        Tries trafilatura first, falls back to selectolax/BeautifulSoup.
         
         Args:
             url: URL to extract content from
@@ -154,13 +355,45 @@ class ContentExtractor:
         Raises:
             ValueError: If content extraction fails
         """
-        # Try newspaper3k first (better for articles)
-        content = self.extract_with_newspaper(url)
+        self._check_url_type(url)
         
-        # Fallback to BeautifulSoup
-        if not content or not content.get('text'):
-            content = self.extract_with_beautifulsoup(url)
+        html = self._fetch_html(url)
+        return self._finalize(self._extract_from_html(html))
+    
+    async def extract_async(self, url: str) -> Dict[str, str]:
+        """
+        Async variant of extract.
+        The page is downloaded without blocking the event loop; extraction
+        is CPU-bound and runs in a worker thread.
+        
+        Args:
+            url: URL to extract content from
+            
+        Returns:
+            Dictionary with extracted content
+            
+        Raises:
+            ValueError: If content extraction fails
+        """
+        self._check_url_type(url)
+        
+        html = await self._fetch_html_async(url)
+        content = await asyncio.to_thread(self._extract_from_html, html)
+        return self._finalize(content)
+    
+    def _check_url_type(self, url: str) -> None:
+        """
+        Reject URLs that obviously point to non-HTML resources.
         
+        Raises:
+            ValueError: If the URL path has a non-HTML file extension
+        """
+        path = urlparse(str(url)).path.lower()
+        if path.endswith(NON_HTML_EXTENSIONS):
+            raise ValueError(f"URL does not point to an HTML page: {path.rsplit('/', 1)[-1]}")
+    
+    def _finalize(self, content: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Validate and truncate extracted content."""
         # Validate extraction
         if not content or not content.get('text'):
             raise ValueError("Failed to extract content from URL")
@@ -174,6 +407,12 @@ class ContentExtractor:
         return content
 
 
+@lru_cache(maxsize=1)
+def _get_content_extractor() -> ContentExtractor:
+    """Get the shared ContentExtractor instance (created on first use)."""
+    return ContentExtractor()
+
+
 # Convenience function
 def extract_content(url: str) -> Dict[str, str]:
     """
@@ -185,5 +424,4 @@ def extract_content(url: str) -> Dict[str, str]:
     Returns:
         Dictionary with extracted content
     """
-    extractor = ContentExtractor()
-    return extractor.extract(url)
+    return _get_content_extractor().extract(url)
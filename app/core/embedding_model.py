@@ -0,0 +1,45 @@
+"""
+Embedding Model Module
+Loads the sentence-transformer embedding model shared by the NLP components.
+Supports the default PyTorch backend or an int8-quantized ONNX backend.
+"""
+
+import logging
+from functools import lru_cache
+import torch
+from sentence_transformers import SentenceTransformer
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pre-quantized int8 weights published with the sentence-transformers models
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> SentenceTransformer:
+    """
+    Get the shared embedding model (loaded once per process).
+    
+    Returns:
+        SentenceTransformer configured for settings.embedding_model_backend
+    """
+    if settings.embedding_model_backend == "onnx":
+        model = SentenceTransformer(
+            settings.embedding_model,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_QUANTIZED_FILE}
+        )
+    else:
+        model = SentenceTransformer(settings.embedding_model)
+        # Half precision halves memory traffic of the embedding matmuls on GPU
+        if torch.cuda.is_available():
+            model.half()
+    
+    # Optionally cap input length below the model's own limit to bound encode cost
+    if settings.embedding_max_seq_length > 0:
+        model.max_seq_length = min(model.max_seq_length, settings.embedding_max_seq_length)
+    
+    logger.info(f"Embedding model loaded: {settings.embedding_model} "
+                f"(backend: {settings.embedding_model_backend})")
+    return model
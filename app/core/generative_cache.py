@@ -0,0 +1,151 @@
+"""
+Generative Cache Module
+Semantic-similarity cache for LLM responses.
+Prompts are embedded with the shared sentence-transformer and matched
+against past prompts in a FAISS inner-product index, persisted to disk.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+import orjson
+from app.config import settings
+from app.core.embedding_model import get_embedding_model
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "cache.faiss"
+DATA_FILE = "cache.jsonl"
+
+
+class GenerativeCache:
+    """Caches LLM responses keyed by prompt embedding similarity."""
+
+    def __init__(self, cache_dir: str, threshold: float = 0.97):
+        """
+        Initialize the cache, loading any persisted entries.
+
+        Args:
+            cache_dir: Directory holding cache.faiss and cache.jsonl
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        import faiss
+
+        self._faiss = faiss
+        self.threshold = threshold
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.data_path = os.path.join(cache_dir, DATA_FILE)
+        self.model = get_embedding_model()
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index, self.entries = self._load()
+        logger.info(f"GenerativeCache loaded with {len(self.entries)} entries")
+
+    def _load(self):
+        """Load the persisted index and entries, starting fresh if they disagree."""
+        dim = self.model.get_sentence_embedding_dimension()
+        entries: List[dict] = []
+
+        if os.path.isfile(self.index_path) and os.path.isfile(self.data_path):
+            with open(self.data_path, 'rb') as f:
+                entries = [orjson.loads(line) for line in f if line.strip()]
+            index = self._faiss.read_index(self.index_path)
+            if index.ntotal == len(entries) and index.d == dim:
+                return index, entries
+            logger.warning("Generative cache files are out of sync, starting fresh")
+
+        # Cosine similarity == inner product of L2-normalized vectors
+        index = self._faiss.IndexFlatIP(dim)
+        open(self.data_path, 'wb').close()
+        return index, []
+
+    @staticmethod
+    def _scope_key(scope: str) -> str:
+        """Hash the exact-match part of a cache key."""
+        return hashlib.blake2b(scope.encode('utf-8'), digest_size=16).hexdigest()
+
+    def embed(self, prompt: str) -> np.ndarray:
+        """
+        Embed a prompt for lookup/insertion.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            L2-normalized float32 embedding of shape (1, dim)
+        """
+        embedding = self.model.encode([prompt], normalize_embeddings=True)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def lookup(self, embedding: np.ndarray, scope: str = "") -> Optional[str]:
+        """
+        Find a cached response for a similar prompt.
+
+        Args:
+            embedding: Prompt embedding from embed()
+            scope: Text that must match exactly (e.g. generation requirements)
+
+        Returns:
+            Cached response or None on a miss
+        """
+        scope_key = self._scope_key(scope)
+
+        with self._lock:
+            if self.index.ntotal == 0:
+                return None
+            k = min(self.index.ntotal, 8)
+            scores, ids = self.index.search(embedding, k)
+
+            for score, idx in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                entry = self.entries[idx]
+                if entry["scope"] == scope_key:
+                    logger.info(f"Generative cache hit (similarity: {score:.3f})")
+                    return entry["response"]
+
+        return None
+
+    def add(self, embedding: np.ndarray, response: str, scope: str = ""):
+        """
+        Insert a response and persist it.
+
+        Args:
+            embedding: Prompt embedding from embed()
+            response: LLM response to cache
+            scope: Text that must match exactly on lookup
+        """
+        entry = {"scope": self._scope_key(scope), "response": response}
+
+        with self._lock:
+            self.index.add(embedding)
+            self.entries.append(entry)
+            with open(self.data_path, 'ab') as f:
+                f.write(orjson.dumps(entry) + b"\n")
+            self._faiss.write_index(self.index, self.index_path)
+
+
+@lru_cache(maxsize=1)
+def get_generative_cache() -> Optional[GenerativeCache]:
+    """
+    Get the shared generative cache.
+
+    Returns:
+        GenerativeCache, or None if disabled or FAISS is not installed
+    """
+    if not settings.use_faiss_cache:
+        return None
+
+    try:
+        return GenerativeCache(
+            cache_dir=settings.generative_cache_dir,
+            threshold=settings.generative_cache_threshold
+        )
+    except ImportError:
+        logger.warning("USE_FAISS_CACHE is enabled but faiss is not installed, caching disabled")
+        return None
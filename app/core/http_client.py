@@ -0,0 +1,244 @@
+"""
+HTTP Client Module
+Shared, connection-pooled HTTP clients for outbound requests.
+Reusing clients keeps TCP/TLS connections alive across calls (HTTP/2 where supported).
+
+User-supplied URLs are fetched through the public-only clients: their
+connections can only be opened to publicly routable addresses, and
+redirects are followed by hand so every hop is checked (SSRF protection).
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, Tuple
+import httpcore
+import httpx
+from app.core.address_guard import (
+    BlockedURLError,
+    NON_PUBLIC_ERROR,
+    check_public_addresses,
+    check_public_url,
+    check_public_url_async,
+    resolve_host,
+    resolve_host_async
+)
+
+logger = logging.getLogger(__name__)
+
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16)
+HTTP_RETRIES = 2  # Retries for failed connection attempts (not HTTP error statuses)
+MAX_REDIRECTS = 5  # Redirect hops followed when fetching user-supplied URLs
+
+# Async clients are bound to the event loop they were created on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_public_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Get the shared synchronous HTTP client."""
+    transport = httpx.HTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES)
+    return httpx.Client(transport=transport, follow_redirects=True)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared asynchronous HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES)
+        client = httpx.AsyncClient(transport=transport, follow_redirects=True)
+        _async_clients[loop] = client
+    return client
+
+
+def _public_addresses(host: str, addresses: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Return the addresses a connection to host may use.
+
+    Raises:
+        httpcore.ConnectError: If any address is not publicly routable
+    """
+    is_public, _ = check_public_addresses(addresses)
+    if not is_public:
+        raise httpcore.ConnectError(f"{NON_PUBLIC_ERROR}: {host}")
+    return addresses
+
+
+class _PublicOnlyBackend(httpcore.SyncBackend):
+    """
+    Network backend that resolves hosts itself and connects only to the
+    addresses it has checked, so DNS cannot change between check and connect.
+    """
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = _public_addresses(host, resolve_host(host))
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        error = None
+        for address in addresses:
+            try:
+                return super().connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as e:
+                error = e
+        raise error
+
+
+class _PublicOnlyAsyncBackend(httpcore.AnyIOBackend):
+    """Async variant of _PublicOnlyBackend."""
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = _public_addresses(host, await resolve_host_async(host))
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        error = None
+        for address in addresses:
+            try:
+                return await super().connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as e:
+                error = e
+        raise error
+
+
+def _pool_options() -> dict:
+    """Connection pool settings shared by the public-only transports."""
+    return dict(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=HTTP_LIMITS.max_connections,
+        max_keepalive_connections=HTTP_LIMITS.max_keepalive_connections,
+        keepalive_expiry=HTTP_LIMITS.keepalive_expiry,
+        http2=True,
+        retries=HTTP_RETRIES
+    )
+
+
+class _PublicOnlyTransport(httpx.HTTPTransport):
+    """HTTPTransport whose connections go through _PublicOnlyBackend."""
+
+    def __init__(self):
+        super().__init__()
+        self._pool = httpcore.ConnectionPool(network_backend=_PublicOnlyBackend(), **_pool_options())
+
+
+class _PublicOnlyAsyncTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport whose connections go through _PublicOnlyAsyncBackend."""
+
+    def __init__(self):
+        super().__init__()
+        self._pool = httpcore.AsyncConnectionPool(network_backend=_PublicOnlyAsyncBackend(), **_pool_options())
+
+
+@lru_cache(maxsize=1)
+def get_public_http_client() -> httpx.Client:
+    """
+    Get the shared synchronous client for user-supplied URLs.
+    Proxies from the environment are ignored, since a proxy would resolve
+    (and could reach) hosts on our behalf.
+    """
+    return httpx.Client(transport=_PublicOnlyTransport(), follow_redirects=False, trust_env=False)
+
+
+def get_public_async_http_client() -> httpx.AsyncClient:
+    """Get the shared asynchronous client for user-supplied URLs on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _public_async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            transport=_PublicOnlyAsyncTransport(),
+            follow_redirects=False,
+            trust_env=False
+        )
+        _public_async_clients[loop] = client
+    return client
+
+
+@contextmanager
+def stream_public(url: str, **kwargs) -> Iterator[httpx.Response]:
+    """
+    Stream a GET of a user-supplied URL, following redirects by hand.
+    Every hop must be http(s) and resolve only to public addresses.
+
+    Args:
+        url: URL to fetch
+        **kwargs: Request options (headers, timeout)
+
+    Yields:
+        Final (non-redirect) streamed response
+
+    Raises:
+        BlockedURLError: If the URL or a redirect target is not allowed
+        httpx.TooManyRedirects: If more than MAX_REDIRECTS hops are needed
+        httpx.HTTPError: On transport errors
+    """
+    client = get_public_http_client()
+    request = client.build_request('GET', url, **kwargs)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        is_public, error = check_public_url(str(request.url))
+        if not is_public:
+            raise BlockedURLError(error)
+
+        response = client.send(request, stream=True)
+        if response.next_request is None:
+            try:
+                yield response
+            finally:
+                response.close()
+            return
+
+        response.close()
+        request = response.next_request
+
+    raise httpx.TooManyRedirects("Too many redirects", request=request)
+
+
+@asynccontextmanager
+async def stream_public_async(url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Async variant of stream_public."""
+    client = get_public_async_http_client()
+    request = client.build_request('GET', url, **kwargs)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        is_public, error = await check_public_url_async(str(request.url))
+        if not is_public:
+            raise BlockedURLError(error)
+
+        response = await client.send(request, stream=True)
+        if response.next_request is None:
+            try:
+                yield response
+            finally:
+                await response.aclose()
+            return
+
+        await response.aclose()
+        request = response.next_request
+
+    raise httpx.TooManyRedirects("Too many redirects", request=request)
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients (called on application shutdown)."""
+    loop = asyncio.get_running_loop()
+    for clients in (_async_clients, _public_async_clients):
+        client = clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    for get_client in (get_http_client, get_public_http_client):
+        if get_client.cache_info().currsize:
+            get_client().close()
+            get_client.cache_clear()
+
+    logger.info("HTTP clients closed")
@@ -4,12 +4,20 @@ Fetches relevant images for blog posts from Unsplash API.
 """
 
 import logging
-import requests
+import threading
+import httpx
 from typing import List, Dict, Optional
+from cachetools import TTLCache
 from app.config import settings
+from app.core.http_client import get_http_client, get_async_http_client
 
 logger = logging.getLogger(__name__)
 
+# Search results keyed by (query, num_images, orientation), shared by all
+# instances to spare the Unsplash hourly quota on repeated topics
+_search_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_search_cache_lock = threading.Lock()
+
 
 class ImageFetcher:
     """Fetches relevant images for blog content."""
@@ -44,23 +52,25 @@ class ImageFetcher:
             logger.warning("No Unsplash API key - returning empty image list")
             return []
         
+        # Use top 3 keywords for search
+        search_query = self._build_query(keywords)
+        if not search_query:
+            logger.info("No keywords for image search - skipping Unsplash call")
+            return []
+        
+        cache_key = (search_query, num_images, orientation)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Use top 3 keywords for search
-            search_query = " ".join(keywords[:3]) if keywords else "blog post"
             logger.info(f"Searching Unsplash for images: '{search_query}'")
             
             # Call Unsplash search API
-            response = requests.get(
+            response = get_http_client().get(
                 f"{self.base_url}/search/photos",
-                params={
-                    "query": search_query,
-                    "per_page": num_images,
-                    "orientation": orientation,
-                    "content_filter": "high"  # Family-friendly content
-                },
-                headers={
-                    "Authorization": f"Client-ID {self.unsplash_access_key}"
-                },
+                params=self._search_params(search_query, num_images, orientation),
+                headers=self._auth_headers(),
                 timeout=self.timeout
             )
             
@@ -68,36 +78,141 @@ class ImageFetcher:
                 logger.error(f"Unsplash API error: {response.status_code} - {response.text}")
                 return []
             
-            data = response.json()
-            results = data.get("results", [])
+            images = self._parse_results(response.json(), search_query, num_images)
+            self._set_cached(cache_key, images)
+            return images
             
-            if not results:
-                logger.warning(f"No images found for query: '{search_query}'")
-                return []
+        except httpx.TimeoutException:
+            logger.error("Unsplash API request timed out")
+            return []
+        except Exception as e:
+            logger.error(f"Error fetching images from Unsplash: {str(e)}")
+            return []
+    
+    async def fetch_images_async(
+        self,
+        keywords: List[str],
+        num_images: int = 3,
+        orientation: str = "landscape"
+    ) -> List[Dict[str, str]]:
+        """
+        Async variant of fetch_images.
+        
+        Args:
+            keywords: List of search keywords
+            num_images: Number of images to fetch (default: 3)
+            orientation: Image orientation - landscape, portrait, or squarish
             
-            # Parse image data
-            images = []
-            for img in results[:num_images]:
-                images.append({
-                    "url": img["urls"]["regular"],
-                    "url_small": img["urls"]["small"],
-                    "url_thumb": img["urls"]["thumb"],
-                    "alt_text": img.get("alt_description") or img.get("description") or search_query,
-                    "photographer": img["user"]["name"],
-                    "photographer_url": img["user"]["links"]["html"],
-                    "download_location": img["links"]["download_location"]
-                })
+        Returns:
+            List of image dictionaries with url, alt_text, photographer, etc.
+        """
+        if not self.unsplash_access_key:
+            logger.warning("No Unsplash API key - returning empty image list")
+            return []
+        
+        search_query = self._build_query(keywords)
+        if not search_query:
+            logger.info("No keywords for image search - skipping Unsplash call")
+            return []
+        
+        cache_key = (search_query, num_images, orientation)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            logger.info(f"Searching Unsplash for images: '{search_query}'")
+            
+            response = await get_async_http_client().get(
+                f"{self.base_url}/search/photos",
+                params=self._search_params(search_query, num_images, orientation),
+                headers=self._auth_headers(),
+                timeout=self.timeout
+            )
             
-            logger.info(f"Successfully fetched {len(images)} images from Unsplash")
+            if response.status_code != 200:
+                logger.error(f"Unsplash API error: {response.status_code} - {response.text}")
+                return []
+            
+            images = self._parse_results(response.json(), search_query, num_images)
+            self._set_cached(cache_key, images)
             return images
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("Unsplash API request timed out")
             return []
         except Exception as e:
             logger.error(f"Error fetching images from Unsplash: {str(e)}")
             return []
     
+    def _build_query(self, keywords: List[str]) -> str:
+        """Build the search query from the top 3 non-blank keywords."""
+        terms = [keyword.strip() for keyword in keywords if keyword and keyword.strip()]
+        return " ".join(terms[:3]) or settings.image_default_query.strip()
+    
+    def _get_cached(self, cache_key: tuple) -> Optional[List[Dict[str, str]]]:
+        """Return cached search results, if still fresh."""
+        with _search_cache_lock:
+            images = _search_cache.get(cache_key)
+        if images is not None:
+            logger.info(f"Using cached Unsplash results for '{cache_key[0]}'")
+            return [dict(img) for img in images]
+        return None
+    
+    def _set_cached(self, cache_key: tuple, images: List[Dict[str, str]]):
+        """Cache successful search results."""
+        with _search_cache_lock:
+            _search_cache[cache_key] = [dict(img) for img in images]
+    
+    def _search_params(self, search_query: str, num_images: int, orientation: str) -> Dict:
+        """Query parameters for the Unsplash search endpoint."""
+        return {
+            "query": search_query,
+            "per_page": num_images,
+            "orientation": orientation,
+            "content_filter": "high"  # Family-friendly content
+        }
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authorization headers for the Unsplash API."""
+        return {
+            "Authorization": f"Client-ID {self.unsplash_access_key}"
+        }
+    
+    def _parse_results(self, data: Dict, search_query: str, num_images: int) -> List[Dict[str, str]]:
+        """
+        Parse Unsplash search response into image dictionaries.
+        
+        Args:
+            data: Decoded JSON response
+            search_query: Query used (fallback alt text)
+            num_images: Maximum number of images to return
+            
+        Returns:
+            List of image dictionaries
+        """
+        results = data.get("results", [])
+        
+        if not results:
+            logger.warning(f"No images found for query: '{search_query}'")
+            return []
+        
+        # Parse image data
+        images = []
+        for img in results[:num_images]:
+            images.append({
+                "url": img["urls"]["regular"],
+                "url_small": img["urls"]["small"],
+                "url_thumb": img["urls"]["thumb"],
+                "alt_text": img.get("alt_description") or img.get("description") or search_query,
+                "photographer": img["user"]["name"],
+                "photographer_url": img["user"]["links"]["html"],
+                "download_location": img["links"]["download_location"]
+            })
+        
+        logger.info(f"Successfully fetched {len(images)} images from Unsplash")
+        return images
+    
     def get_featured_image(self, keywords: List[str]) -> Optional[Dict[str, str]]:
         """
         Get a single featured image for the blog post.
@@ -110,3 +225,65 @@ class ImageFetcher:
         """
         images = self.fetch_images(keywords, num_images=1)
         return images[0] if images else None
+    
+    async def get_featured_image_async(self, keywords: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Async variant of get_featured_image.
+        
+        Args:
+            keywords: List of keywords for search
+            
+        Returns:
+            Single image dictionary or None
+        """
+        images = await self.fetch_images_async(keywords, num_images=1)
+        return images[0] if images else None
+    
+    def fetch_batch(
+        self,
+        keywords: List[str],
+        featured: bool = True,
+        additional: int = 3
+    ) -> Dict:
+        """
+        Fetch the featured and additional images with a single search request.
+        
+        Args:
+            keywords: List of keywords for search
+            featured: Whether to pick a featured image (the top result)
+            additional: Number of additional images after the featured one
+            
+        Returns:
+            Dictionary with 'featured' (image dictionary or None) and 'additional' (list)
+        """
+        images = self.fetch_images(keywords, num_images=int(featured) + additional)
+        return self._split_batch(images, featured)
+    
+    async def fetch_batch_async(
+        self,
+        keywords: List[str],
+        featured: bool = True,
+        additional: int = 3
+    ) -> Dict:
+        """
+        Async variant of fetch_batch.
+        
+        Args:
+            keywords: List of keywords for search
+            featured: Whether to pick a featured image (the top result)
+            additional: Number of additional images after the featured one
+            
+        Returns:
+            Dictionary with 'featured' (image dictionary or None) and 'additional' (list)
+        """
+        images = await self.fetch_images_async(keywords, num_images=int(featured) + additional)
+        return self._split_batch(images, featured)
+    
+    def _split_batch(self, images: List[Dict[str, str]], featured: bool) -> Dict:
+        """Split batched search results into featured and additional images."""
+        if featured:
+            return {
+                "featured": images[0] if images else None,
+                "additional": images[1:]
+            }
+        return {"featured": None, "additional": images}
@@ -5,12 +5,22 @@ Identifies primary and secondary keywords with their relevance scores.
 """
 
 import logging
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
 from typing import List, Tuple, Dict
+import numpy as np
+from cachetools import LRUCache
 from keybert import KeyBERT
+from sklearn.feature_extraction.text import CountVectorizer
 from app.config import settings
+from app.core.embedding_model import get_embedding_model
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r'\w+')
+
 
 class KeywordExtractor:
     """Extracts keywords using KeyBERT and sentence transformers."""
@@ -19,11 +29,45 @@ class KeywordExtractor:
         """Initialize KeyBERT with lightweight embedding model."""
         try:
             # Use lightweight model for cost optimization
-            self.model = KeyBERT(model=settings.embedding_model)
+            self.model = KeyBERT(model=get_embedding_model())
             logger.info(f"KeyBERT initialized with model: {settings.embedding_model}")
         except Exception as e:
             logger.error(f"Failed to initialize KeyBERT: {str(e)}")
             raise
+        
+        # Candidate n-gram embeddings reused across calls (bounded, least
+        # recently used evicted). Requests run in worker threads, so access
+        # is locked; encoding happens outside the lock
+        self._embedding_cache: LRUCache = LRUCache(maxsize=20000)
+        self._embedding_cache_lock = threading.Lock()
+    
+    def _embed_candidates(self, candidates: List[str]) -> np.ndarray:
+        """
+        Embed candidate keyphrases, reusing embeddings computed by earlier calls.
+        
+        Args:
+            candidates: Candidate keyphrases
+            
+        Returns:
+            Array of candidate embeddings in the same order
+        """
+        # Collected locally, so evictions by other threads cannot affect this call
+        embeddings: Dict[str, np.ndarray] = {}
+        with self._embedding_cache_lock:
+            for candidate in candidates:
+                embedding = self._embedding_cache.get(candidate)
+                if embedding is not None:
+                    embeddings[candidate] = embedding
+        
+        missing = [c for c in candidates if c not in embeddings]
+        if missing:
+            # One batched encode for all new candidates
+            computed = dict(zip(missing, self.model.model.embed(missing)))
+            embeddings.update(computed)
+            with self._embedding_cache_lock:
+                self._embedding_cache.update(computed)
+        
+        return np.vstack([embeddings[c] for c in candidates])
     
     def extract_keywords(
         self, 
@@ -51,14 +95,28 @@ class KeywordExtractor:
                 logger.warning("Text too short for keyword extraction")
                 return []
             
+            # Build candidates with the same vectorizer settings KeyBERT uses,
+            # so their embeddings can be cached and passed in precomputed
+            try:
+                candidates = CountVectorizer(
+                    ngram_range=keyphrase_ngram_range,
+                    stop_words='english'
+                ).fit([text]).get_feature_names_out().tolist()
+            except ValueError:
+                logger.warning("No keyword candidates found in text")
+                return []
+            
             # Extract keywords
             keywords = self.model.extract_keywords(
                 text,
+                candidates=candidates,
                 keyphrase_ngram_range=keyphrase_ngram_range,
                 stop_words='english',
                 top_n=top_n,
                 use_maxsum=use_maxsum,
-                diversity=diversity
+                diversity=diversity,
+                doc_embeddings=self.model.model.embed([text]),
+                word_embeddings=self._embed_candidates(candidates)
             )
             
             logger.info(f"Extracted {len(keywords)} keywords")
@@ -112,17 +170,30 @@ class KeywordExtractor:
         Returns:
             Dictionary mapping keyword to density (0.0-1.0)
         """
-        text_lower = text.lower()
-        words = text_lower.split()
+        words = _WORD_RE.findall(text.lower())
         total_words = len(words)
         
         if total_words == 0:
             return {}
         
+        keyword_tokens = {keyword: tuple(_WORD_RE.findall(keyword.lower())) for keyword in keywords}
+        
+        # One pass over the text per distinct n-gram length, instead of one
+        # full-text scan per keyword; unigrams are counted as plain words so
+        # no per-word tuples are allocated
+        ngram_counts = {
+            n: Counter(words) if n == 1 else Counter(zip(*(words[i:] for i in range(n))))
+            for n in {len(tokens) for tokens in keyword_tokens.values() if tokens}
+        }
+        
         density = {}
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            count = text_lower.count(keyword_lower)
+        for keyword, tokens in keyword_tokens.items():
+            if not tokens:
+                count = 0
+            elif len(tokens) == 1:
+                count = ngram_counts[1][tokens[0]]
+            else:
+                count = ngram_counts[len(tokens)][tokens]
             density[keyword] = round(count / total_words, 4)
         
         return density
@@ -168,6 +239,12 @@ class KeywordExtractor:
         return result
 
 
+@lru_cache(maxsize=1)
+def _get_keyword_extractor() -> KeywordExtractor:
+    """Get the shared KeywordExtractor instance (created on first use)."""
+    return KeywordExtractor()
+
+
 # Convenience function
 def extract_keywords(text: str) -> Dict:
     """
@@ -179,5 +256,4 @@ def extract_keywords(text: str) -> Dict:
     Returns:
         Dictionary with keyword data
     """
-    extractor = KeywordExtractor()
-    return extractor.extract_and_categorize(text)
+    return _get_keyword_extractor().extract_and_categorize(text)
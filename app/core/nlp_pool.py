@@ -0,0 +1,41 @@
+"""
+NLP Process Pool Module
+Worker processes for the CPU-bound NLP steps (keyword extraction, topic analysis).
+Each worker loads its own models once, so concurrent requests are not
+serialized on the GIL.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker() -> None:
+    """Load the NLP models once per worker process (not per task)."""
+    from app.core.keyword_extractor import _get_keyword_extractor
+    from app.core.topic_analyzer import _get_topic_analyzer
+
+    _get_keyword_extractor()
+    _get_topic_analyzer()
+
+
+def create_nlp_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool for the NLP steps.
+    Workers are spawned rather than forked, since forking a process that
+    already initialized torch can deadlock its thread pools.
+
+    Args:
+        max_workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor whose workers have the models preloaded
+    """
+    logger.info(f"Starting NLP process pool with {max_workers} workers")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    )
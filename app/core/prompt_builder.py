@@ -5,10 +5,34 @@ Combines extracted data (keywords, topics, intent) into structured prompts.
 """
 
 import logging
-from typing import Dict, List, Literal
+import string
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Fixed-by-configuration template values baked into specialized templates
+TONES = ("professional", "casual", "technical", "conversational")
+KEYWORD_DENSITY_TARGETS = (2.0, 1.5, 1.0)
+
+
+def _compile_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Split a format template into (literal_text, field_name) segments once,
+    so filling it is plain concatenation instead of re-parsing the format
+    string (fields must use no conversions or format specs).
+    
+    Args:
+        template: str.format-style template
+        
+    Returns:
+        Tuple of (literal_text, field_name or None) segments
+    """
+    return tuple(
+        (literal_text, field_name)
+        for literal_text, field_name, _, _ in string.Formatter().parse(template)
+    )
+
 
 class PromptBuilder:
     """Builds structured prompts for blog generation."""
@@ -68,8 +92,27 @@ Secondary Keywords: {secondary_keywords}
     "tags": ["tag1", "tag2", "tag3"]
 }}"""
     
+    _COMPILED_TEMPLATE = _compile_template(BLOG_GENERATION_TEMPLATE)
+    
     def __init__(self):
-        pass
+        # One template per (tone, density target) with both values baked in,
+        # leaving only the per-page fields to fill
+        self._specialized_templates = {
+            (tone, density): _compile_template(
+                self.BLOG_GENERATION_TEMPLATE
+                .replace('{tone}', tone)
+                .replace('{keyword_density_target}', str(density))
+            )
+            for tone in TONES
+            for density in KEYWORD_DENSITY_TARGETS
+        }
+    
+    def _render_template(self, segments: Tuple[Tuple[str, Optional[str]], ...], **fields) -> str:
+        """Fill a precompiled template."""
+        return ''.join([
+            literal_text + str(fields[field_name]) if field_name is not None else literal_text
+            for literal_text, field_name in segments
+        ])
     
     def format_keywords(self, keywords: List[str]) -> str:
         """Format keyword list as comma-separated string."""
@@ -79,7 +122,7 @@ Secondary Keywords: {secondary_keywords}
         """Format topics as bullet points."""
         if not topics:
             return "- General content"
-        return "\n".join([f"- {topic}" for topic in topics])
+        return "- " + "\n- ".join(topics)
     
     def calculate_keyword_density_target(self, word_count: int) -> float:
         """
@@ -132,8 +175,10 @@ Secondary Keywords: {secondary_keywords}
         # Calculate keyword density target
         kw_density = self.calculate_keyword_density_target(word_count)
         
-        # Format data
-        prompt = self.BLOG_GENERATION_TEMPLATE.format(
+        # Format data (generic template for unknown tones)
+        segments = self._specialized_templates.get((tone, kw_density), self._COMPILED_TEMPLATE)
+        prompt = self._render_template(
+            segments,
             url=url,
             title=title or "N/A",
             summary=summary or "No summary available",
@@ -181,6 +226,12 @@ Return the revised blog in the same JSON format as the original."""
         return prompt
 
 
+@lru_cache(maxsize=1)
+def _get_prompt_builder() -> PromptBuilder:
+    """Get the shared PromptBuilder instance (created on first use)."""
+    return PromptBuilder()
+
+
 # Convenience function
 def build_blog_prompt(
     url: str,
@@ -204,7 +255,7 @@ def build_blog_prompt(
     Returns:
         Formatted prompt
     """
-    builder = PromptBuilder()
+    builder = _get_prompt_builder()
     
     return builder.build_prompt(
         url=url,
@@ -0,0 +1,58 @@
+"""
+Rate Limiter Module
+Token-bucket rate limiting for external API calls.
+Paces requests below provider quotas so retries (429s) become rare.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared across threads and coroutines."""
+    
+    def __init__(self, max_calls: int, period: float = 60.0):
+        """
+        Args:
+            max_calls: Maximum number of calls allowed per period
+            period: Period length in seconds
+        """
+        self.capacity = max(1, max_calls)
+        self.rate = self.capacity / period  # tokens per second
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """
+        Take one token from the bucket.
+        
+        Returns:
+            Seconds to wait before the reserved token becomes available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.info(f"Rate limit reached - waiting {wait:.2f}s")
+            time.sleep(wait)
+    
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a call is allowed."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.info(f"Rate limit reached - waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
@@ -6,11 +6,69 @@ Ensures keyword coverage, validates meta descriptions, and optimizes structure.
 
 import logging
 import re
-from typing import Dict, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
 from collections import Counter
+import ahocorasick
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Tokenizers shared by every check (compiled once)
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_RE = re.compile(r'[.!?]+')
+
+
+@dataclass(slots=True)
+class MetaValidation:
+    """Meta description validation result."""
+    length: int
+    is_valid: bool
+    issue: Optional[str] = None
+
+
+@dataclass(slots=True)
+class TitleValidation:
+    """Title validation result."""
+    length: int
+    is_valid: bool
+    issue: Optional[str] = None
+
+
+@dataclass(slots=True)
+class HeadingStructure:
+    """Heading structure validation result."""
+    has_h1: bool
+    h2_count: int
+    is_valid: bool
+    recommendations: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Readability:
+    """Readability metrics (averages are None when the text is empty)."""
+    level: str
+    avg_sentence_length: Optional[float] = None
+    avg_word_length: Optional[float] = None
+
+
+@dataclass(slots=True)
+class SEOAnalysis:
+    """Complete SEO analysis of a blog post."""
+    word_count: int
+    keyword_densities: Dict[str, float]
+    meta_description: MetaValidation
+    title: TitleValidation
+    heading_structure: HeadingStructure
+    readability: Readability
+    recommendations: List[str]
+    seo_score: int
+    
+    def to_json(self) -> bytes:
+        """Serialize to JSON (orjson handles dataclasses natively)."""
+        return orjson.dumps(self)
+
 
 class SEOPostProcessor:
     """Post-processes blog content for SEO optimization."""
@@ -25,62 +83,114 @@ class SEOPostProcessor:
         self.keyword_density_max = 0.025  # 2.5%
     
     def count_words(self, text: str) -> int:
-        """Count words in text."""
-        words = re.findall(r'\b\w+\b', text.lower())
-        return len(words)
+        """Count words in text (same tokenization as process())."""
+        return len(_WORD_RE.findall(text))
     
-    def get_full_text(self, blog_data: Dict) -> str:
+    def _iter_text_parts(self, blog_data: Dict) -> Iterator[str]:
         """
-        Extract all text from blog structure.
+        Yield each text part of the blog structure (title, intro, conclusion,
+        then section headings and content).
         
         Args:
             blog_data: Blog content dictionary
             
-        Returns:
-            Complete blog text
+        Yields:
+            Text parts in order
         """
-        text_parts = [
-            blog_data.get('title', ''),
-            blog_data.get('introduction', ''),
-            blog_data.get('conclusion', ''),
-        ]
+        yield blog_data.get('title', '')
+        yield blog_data.get('introduction', '')
+        yield blog_data.get('conclusion', '')
         
         # Add section content
         for section in blog_data.get('sections', []):
-            text_parts.append(section.get('heading', ''))
-            text_parts.append(section.get('content', ''))
-        
-        return ' '.join(text_parts)
+            yield section.get('heading', '')
+            yield section.get('content', '')
     
-    def check_keyword_density(self, text: str, keywords: List[str]) -> Dict[str, float]:
+    def get_full_text(self, blog_data: Dict) -> str:
         """
-        Check keyword density in content.
+        Extract all text from blog structure.
         
         Args:
-            text: Full blog text
-            keywords: List of keywords to check
+            blog_data: Blog content dictionary
             
         Returns:
-            Dictionary of keyword densities
+            Complete blog text
+        """
+        return ' '.join(self._iter_text_parts(blog_data))
+    
+    def _count_keywords(self, parts: Iterable[str], keywords: List[str]) -> Counter:
         """
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
-        total_words = len(words)
+        Count keyword occurrences with a single Aho-Corasick automaton.
         
+        Args:
+            parts: Text parts to scan
+            keywords: Keywords to count
+            
+        Returns:
+            Counter of non-overlapping occurrences keyed by lowercased keyword
+        """
+        automaton = ahocorasick.Automaton()
+        for keyword_lower in {keyword.lower() for keyword in keywords}:
+            if keyword_lower:
+                automaton.add_word(keyword_lower, keyword_lower)
+        
+        counts: Counter = Counter()
+        if not len(automaton):
+            return counts
+        
+        automaton.make_automaton()
+        for part in parts:
+            # Count non-overlapping occurrences (same as str.count); matches
+            # arrive ordered by end position
+            last_end: Dict[str, int] = {}
+            for end, keyword_lower in automaton.iter(part.lower()):
+                if end - len(keyword_lower) >= last_end.get(keyword_lower, -1):
+                    counts[keyword_lower] += 1
+                    last_end[keyword_lower] = end
+        
+        return counts
+    
+    def _keyword_densities(self, counts: Counter, keywords: List[str], total_words: int) -> Dict[str, float]:
+        """Convert keyword counts into densities."""
         if total_words == 0:
             return {}
         
         densities = {}
         for keyword in keywords:
-            keyword_lower = keyword.lower()
             # Count occurrences (including multi-word keywords)
-            count = text_lower.count(keyword_lower)
+            count = counts[keyword.lower()]
             density = count / total_words
             densities[keyword] = round(density, 4)
         
         return densities
     
-    def validate_meta_description(self, meta_description: str) -> Dict:
+    def check_keyword_density(
+        self,
+        text: str,
+        keywords: List[str],
+        total_words: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Check keyword density in content.
+        All keywords are counted in a single Aho-Corasick pass over the text.
+        
+        Args:
+            text: Full blog text
+            keywords: List of keywords to check
+            total_words: Word count of text, if already computed
+            
+        Returns:
+            Dictionary of keyword densities
+        """
+        if total_words is None:
+            total_words = self.count_words(text)
+        
+        if total_words == 0:
+            return {}
+        
+        return self._keyword_densities(self._count_keywords((text,), keywords), keywords, total_words)
+    
+    def validate_meta_description(self, meta_description: str) -> MetaValidation:
         """
         Validate meta description length and quality.
         
@@ -91,21 +201,17 @@ class SEOPostProcessor:
             Validation results
         """
         length = len(meta_description)
-        
-        result = {
-            'length': length,
-            'is_valid': self.meta_description_min <= length <= self.meta_description_max,
-            'issue': None
-        }
+        is_valid = self.meta_description_min <= length <= self.meta_description_max
+        issue = None
         
         if length < self.meta_description_min:
-            result['issue'] = f"Too short (minimum {self.meta_description_min} chars)"
+            issue = f"Too short (minimum {self.meta_description_min} chars)"
         elif length > self.meta_description_max:
-            result['issue'] = f"Too long (maximum {self.meta_description_max} chars, will be truncated)"
+            issue = f"Too long (maximum {self.meta_description_max} chars, will be truncated)"
         
-        return result
+        return MetaValidation(length=length, is_valid=is_valid, issue=issue)
     
-    def validate_title(self, title: str) -> Dict:
+    def validate_title(self, title: str) -> TitleValidation:
         """
         Validate title length for SEO.
         
@@ -116,19 +222,15 @@ class SEOPostProcessor:
             Validation results
         """
         length = len(title)
+        is_valid = length <= self.title_max_length
+        issue = None
         
-        result = {
-            'length': length,
-            'is_valid': length <= self.title_max_length,
-            'issue': None
-        }
+        if not is_valid:
+            issue = f"Too long (maximum {self.title_max_length} chars for optimal SEO)"
         
-        if length > self.title_max_length:
-            result['issue'] = f"Too long (maximum {self.title_max_length} chars for optimal SEO)"
-        
-        return result
+        return TitleValidation(length=length, is_valid=is_valid, issue=issue)
     
-    def check_heading_structure(self, blog_data: Dict) -> Dict:
+    def check_heading_structure(self, blog_data: Dict) -> HeadingStructure:
         """
         Check if heading structure is proper (H1 -> H2 -> H3).
         
@@ -138,47 +240,67 @@ class SEOPostProcessor:
         Returns:
             Structure validation results
         """
-        sections = blog_data.get('sections', [])
-        
-        result = {
-            'has_h1': bool(blog_data.get('title')),
-            'h2_count': len(sections),
-            'is_valid': True,
-            'recommendations': []
-        }
+        has_h1 = bool(blog_data.get('title'))
+        h2_count = len(blog_data.get('sections', []))
+        recommendations = []
         
-        if not result['has_h1']:
-            result['is_valid'] = False
-            result['recommendations'].append("Add an H1 title")
+        if not has_h1:
+            recommendations.append("Add an H1 title")
         
-        if result['h2_count'] < 3:
-            result['recommendations'].append("Add more H2 sections (3-5 recommended)")
-        elif result['h2_count'] > 7:
-            result['recommendations'].append("Consider consolidating sections (3-7 H2s optimal)")
+        if h2_count < 3:
+            recommendations.append("Add more H2 sections (3-5 recommended)")
+        elif h2_count > 7:
+            recommendations.append("Consider consolidating sections (3-7 H2s optimal)")
         
-        return result
+        return HeadingStructure(
+            has_h1=has_h1,
+            h2_count=h2_count,
+            is_valid=has_h1,
+            recommendations=recommendations
+        )
     
-    def generate_readability_score(self, text: str) -> Dict:
+    def _count_sentences(self, text: str) -> int:
+        """Count non-empty sentences in text."""
+        return sum(1 for sentence in _SENT_RE.split(text) if sentence.strip())
+    
+    def generate_readability_score(self, text: str, words: Optional[List[str]] = None) -> Readability:
         """
         Simple readability assessment.
         Based on average sentence length and word length.
         
         Args:
             text: Text to analyze
+            words: Words of text, if already tokenized
             
         Returns:
             Readability metrics
         """
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        words = re.findall(r'\b\w+\b', text)
+        if words is None:
+            words = _WORD_RE.findall(text)
+        
+        return self._score_readability(
+            len(words),
+            sum(len(word) for word in words),
+            self._count_sentences(text)
+        )
+    
+    def _score_readability(self, word_count: int, word_chars: int, sentence_count: int) -> Readability:
+        """
+        Score readability from word and sentence totals.
         
-        if not sentences or not words:
-            return {'score': 'N/A', 'level': 'unknown'}
+        Args:
+            word_count: Number of words
+            word_chars: Total characters across all words
+            sentence_count: Number of sentences
+            
+        Returns:
+            Readability metrics
+        """
+        if not sentence_count or not word_count:
+            return Readability(level='unknown')
         
-        avg_sentence_length = len(words) / len(sentences)
-        avg_word_length = sum(len(word) for word in words) / len(words)
+        avg_sentence_length = word_count / sentence_count
+        avg_word_length = word_chars / word_count
         
         # Simple scoring
         if avg_sentence_length < 15 and avg_word_length < 5:
@@ -188,11 +310,11 @@ class SEOPostProcessor:
         else:
             level = 'complex'
         
-        return {
-            'avg_sentence_length': round(avg_sentence_length, 1),
-            'avg_word_length': round(avg_word_length, 1),
-            'level': level
-        }
+        return Readability(
+            level=level,
+            avg_sentence_length=round(avg_sentence_length, 1),
+            avg_word_length=round(avg_word_length, 1)
+        )
     
     def process(self, blog_data: Dict, keywords: List[str]) -> Dict:
         """
@@ -203,11 +325,16 @@ class SEOPostProcessor:
             keywords: Target keywords for SEO
             
         Returns:
-            Dictionary with processed blog and SEO analysis
+            Dictionary with processed blog ('blog') and SEOAnalysis ('seo_analysis')
         """
-        # Get full text
-        full_text = self.get_full_text(blog_data)
-        word_count = self.count_words(full_text)
+        # Walk the blog parts once, without joining them into one string
+        parts = list(self._iter_text_parts(blog_data))
+        word_count = word_chars = sentence_count = 0
+        for part in parts:
+            part_words = _WORD_RE.findall(part)
+            word_count += len(part_words)
+            word_chars += sum(len(word) for word in part_words)
+            sentence_count += self._count_sentences(part)
         
         # Validate components
         meta_validation = self.validate_meta_description(blog_data.get('meta_description', ''))
@@ -215,10 +342,12 @@ class SEOPostProcessor:
         heading_structure = self.check_heading_structure(blog_data)
         
         # Check keyword density
-        keyword_densities = self.check_keyword_density(full_text, keywords)
+        keyword_densities = self._keyword_densities(
+            self._count_keywords(parts, keywords), keywords, word_count
+        )
         
         # Generate readability score
-        readability = self.generate_readability_score(full_text)
+        readability = self._score_readability(word_count, word_chars, sentence_count)
         
         # SEO recommendations
         recommendations = []
@@ -226,11 +355,11 @@ class SEOPostProcessor:
         if word_count < self.min_word_count:
             recommendations.append(f"Content is short ({word_count} words). Aim for {self.min_word_count}+ words.")
         
-        if not meta_validation['is_valid']:
-            recommendations.append(f"Meta description issue: {meta_validation['issue']}")
+        if not meta_validation.is_valid:
+            recommendations.append(f"Meta description issue: {meta_validation.issue}")
         
-        if not title_validation['is_valid']:
-            recommendations.append(f"Title issue: {title_validation['issue']}")
+        if not title_validation.is_valid:
+            recommendations.append(f"Title issue: {title_validation.issue}")
         
         # Check keyword usage
         low_density_keywords = [kw for kw, density in keyword_densities.items() 
@@ -238,55 +367,69 @@ class SEOPostProcessor:
         if low_density_keywords:
             recommendations.append(f"Keywords underused: {', '.join(low_density_keywords[:3])}")
         
-        recommendations.extend(heading_structure.get('recommendations', []))
-        
+        recommendations.extend(heading_structure.recommendations)
+        
+        seo_analysis = SEOAnalysis(
+            word_count=word_count,
+            keyword_densities=keyword_densities,
+            meta_description=meta_validation,
+            title=title_validation,
+            heading_structure=heading_structure,
+            readability=readability,
+            recommendations=recommendations,
+            seo_score=self._calculate_seo_score(
+                meta_validation.is_valid,
+                title_validation.is_valid,
+                heading_structure.is_valid,
+                heading_structure.h2_count,
+                word_count,
+                keyword_densities.values()
+            )
+        )
         result = {
             'blog': blog_data,
-            'seo_analysis': {
-                'word_count': word_count,
-                'keyword_densities': keyword_densities,
-                'meta_description': meta_validation,
-                'title': title_validation,
-                'heading_structure': heading_structure,
-                'readability': readability,
-                'recommendations': recommendations,
-                'seo_score': self._calculate_seo_score(
-                    meta_validation, title_validation, 
-                    heading_structure, word_count, keyword_densities
-                )
-            }
+            'seo_analysis': seo_analysis
         }
         
-        logger.info(f"SEO post-processing complete - Score: {result['seo_analysis']['seo_score']}/100")
+        logger.info(f"SEO post-processing complete - Score: {seo_analysis.seo_score}/100")
         
         return result
     
     def _calculate_seo_score(
         self, 
-        meta_val: Dict, 
-        title_val: Dict, 
-        heading_struct: Dict, 
+        meta_ok: bool, 
+        title_ok: bool, 
+        headings_ok: bool, 
+        h2_count: int,
         word_count: int,
-        keyword_densities: Dict
+        densities: Iterable[float]
     ) -> int:
         """
         Calculate overall SEO score (0-100).
         
+        Args:
+            meta_ok: Meta description passed validation
+            title_ok: Title passed validation
+            headings_ok: Heading structure passed validation
+            h2_count: Number of H2 sections
+            word_count: Blog word count
+            densities: Keyword densities
+        
         Returns:
             SEO score
         """
         score = 0
         
         # Meta description (20 points)
-        if meta_val['is_valid']:
+        if meta_ok:
             score += 20
         
         # Title (15 points)
-        if title_val['is_valid']:
+        if title_ok:
             score += 15
         
         # Heading structure (15 points)
-        if heading_struct['is_valid'] and 3 <= heading_struct['h2_count'] <= 7:
+        if headings_ok and 3 <= h2_count <= 7:
             score += 15
         
         # Word count (25 points)
@@ -298,14 +441,25 @@ class SEOPostProcessor:
             score += 10
         
         # Keyword usage (25 points)
-        if keyword_densities:
-            good_keywords = [d for d in keyword_densities.values() 
-                           if self.keyword_density_min <= d <= self.keyword_density_max]
-            score += int((len(good_keywords) / len(keyword_densities)) * 25)
+        density_min = self.keyword_density_min
+        density_max = self.keyword_density_max
+        total = good = 0
+        for density in densities:
+            total += 1
+            if density_min <= density <= density_max:
+                good += 1
+        if total:
+            score += int((good / total) * 25)
         
         return min(score, 100)
 
 
+@lru_cache(maxsize=1)
+def _get_seo_postprocessor() -> SEOPostProcessor:
+    """Get the shared SEOPostProcessor instance (created on first use)."""
+    return SEOPostProcessor()
+
+
 # Convenience function
 def postprocess_blog(blog_data: Dict, keywords: List[str]) -> Dict:
     """
@@ -316,7 +470,7 @@ def postprocess_blog(blog_data: Dict, keywords: List[str]) -> Dict:
         keywords: Target keywords
         
     Returns:
-        Processed blog with SEO analysis
+        Processed blog ('blog') with SEOAnalysis ('seo_analysis')
     """
-    processor = SEOPostProcessor()
+    processor = _get_seo_postprocessor()
     return processor.process(blog_data, keywords)
@@ -6,6 +6,7 @@ Removes noise, normalizes whitespace, and prepares text for analysis.
 
 import logging
 import re
+from functools import lru_cache
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -16,11 +17,22 @@ class TextCleaner:
     
     def __init__(self):
         # Patterns to remove or normalize
-        self.url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        # Single character class: the $-_ range already spans digits,
+        # uppercase letters, %, parentheses, backslash and URL punctuation
+        self.url_pattern = re.compile(r'https?://[!$-_a-z]+')
+        # Part lengths bounded to RFC 5321 limits so each match attempt does
+        # constant work (unbounded parts were quadratic on runs like 'a.a.a.')
+        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,63}\b')
         self.multiple_spaces = re.compile(r'\s+')
         self.multiple_newlines = re.compile(r'\n\s*\n')
         self.special_chars = re.compile(r'[^\w\s.,!?;:\'\"-]')
+        self.non_alphanumeric = re.compile(r'[^a-zA-Z0-9\s]')
+        self.sentence_boundary = re.compile(r'[.!?]+')
+        # URLs, emails and special characters removed in a single scan
+        self.noise_pattern = re.compile('|'.join(
+            f'(?:{pattern.pattern})'
+            for pattern in (self.url_pattern, self.email_pattern, self.special_chars)
+        ))
     
     def remove_urls(self, text: str) -> str:
         """Remove URLs from text."""
@@ -49,7 +61,7 @@ class TextCleaner:
             return self.special_chars.sub('', text)
         else:
             # Remove everything except alphanumeric and spaces
-            return re.sub(r'[^a-zA-Z0-9\s]', '', text)
+            return self.non_alphanumeric.sub('', text)
     
     def remove_short_lines(self, text: str, min_length: int = 20) -> str:
         """
@@ -77,21 +89,18 @@ class TextCleaner:
         if not text:
             return ""
         
-        # Step 1: Remove URLs and emails
-        text = self.remove_urls(text)
-        text = self.remove_emails(text)
+        # Step 1: Remove URLs, emails and special characters (keep basic
+        # punctuation) in one pass
+        text = self.noise_pattern.sub('', text)
         
-        # Step 2: Remove special characters (keep basic punctuation)
-        text = self.remove_special_characters(text, keep_basic_punctuation=True)
-        
-        # Step 3: Normalize whitespace
-        text = self.normalize_whitespace(text)
+        # Step 2: Normalize whitespace (newlines collapse to spaces too)
+        text = self.multiple_spaces.sub(' ', text)
         
-        # Step 4: Remove very short lines (optional, for aggressive cleaning)
+        # Step 3: Remove very short lines (optional, for aggressive cleaning)
         if aggressive:
             text = self.remove_short_lines(text, min_length=30)
         
-        # Step 5: Final normalization
+        # Step 4: Final normalization
         text = text.strip()
         
         logger.info(f"Text cleaned: {len(text)} chars remaining")
@@ -108,7 +117,7 @@ class TextCleaner:
             List of sentences
         """
         # Simple sentence splitting (can be improved with NLTK)
-        sentences = re.split(r'[.!?]+', text)
+        sentences = self.sentence_boundary.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         return sentences
     
@@ -128,6 +137,12 @@ class TextCleaner:
         return text[:max_chars] + "..."
 
 
+@lru_cache(maxsize=1)
+def _get_text_cleaner() -> TextCleaner:
+    """Get the shared TextCleaner instance (created on first use)."""
+    return TextCleaner()
+
+
 # Convenience function
 def clean_text(text: str, aggressive: bool = False) -> str:
     """
@@ -140,5 +155,5 @@ def clean_text(text: str, aggressive: bool = False) -> str:
     Returns:
         Cleaned text
     """
-    cleaner = TextCleaner()
+    cleaner = _get_text_cleaner()
     return cleaner.clean(text, aggressive=aggressive)
@@ -4,15 +4,32 @@ Analyzes text to understand topics, intent, and generate summaries using local N
 Detects website intent (service, product, blog, etc.) and extracts main topics.
 """
 
+import hashlib
 import logging
+import threading
 from typing import List, Dict, Literal
 from collections import Counter
 import re
-from sentence_transformers import SentenceTransformer
+from functools import lru_cache, partial
+import ahocorasick
+import numpy as np
+from cachetools import TTLCache
 from app.config import settings
+from app.core.embedding_model import get_embedding_model
 
 logger = logging.getLogger(__name__)
 
+# Sentence bodies between [.!?] boundaries (compiled once)
+_SENT_ITER = re.compile(r'[^.!?]+')
+# Capitalized phrases of up to 5 words; the bounded repeat caps matching
+# work on long runs of capitalized words
+_ENTITY_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,4}\b')
+
+# Intent scoring stops at a block boundary once one intent clearly dominates
+INTENT_BLOCK_SIZE = 4096
+INTENT_DOMINANCE_RATIO = 3
+INTENT_MIN_SCORE = 5
+
 
 class TopicAnalyzer:
     """Analyzes topics and intent from text using embeddings and heuristics."""
@@ -20,7 +37,14 @@ class TopicAnalyzer:
     def __init__(self):
         """Initialize with sentence transformer for semantic analysis."""
         try:
-            self.model = SentenceTransformer(settings.embedding_model)
+            self.model = get_embedding_model()
+            self._encode = partial(
+                self.model.encode,
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
             logger.info(f"TopicAnalyzer initialized with model: {settings.embedding_model}")
         except Exception as e:
             logger.error(f"Failed to initialize TopicAnalyzer: {str(e)}")
@@ -34,6 +58,23 @@ class TopicAnalyzer:
             'informational': ['about', 'information', 'learn', 'understand', 'explain', 'what is'],
             'commercial': ['pricing', 'plans', 'subscribe', 'premium', 'pro', 'enterprise']
         }
+        
+        # Single automaton over all intent keywords; values carry intent
+        # indices (a keyword may score several intents, e.g. 'learn')
+        self._intent_labels = tuple(self.intent_patterns)
+        keyword_intents: Dict[str, List[int]] = {}
+        for index, keywords in enumerate(self.intent_patterns.values()):
+            for keyword in keywords:
+                keyword_intents.setdefault(keyword.lower(), []).append(index)
+        
+        self.intent_automaton = ahocorasick.Automaton()
+        for keyword, indices in keyword_intents.items():
+            self.intent_automaton.add_word(keyword, (keyword, tuple(indices)))
+        self.intent_automaton.make_automaton()
+        
+        # analyze() results keyed by content fingerprint (repeat URLs skip analysis)
+        self._analysis_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+        self._analysis_cache_lock = threading.Lock()
     
     def extract_topics_from_keywords(self, keywords: List[str], top_n: int = 5) -> List[str]:
         """
@@ -50,6 +91,18 @@ class TopicAnalyzer:
         # Can be enhanced with clustering or topic modeling
         return keywords[:top_n]
     
+    def encode_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Embed sentences in batches.
+        
+        Args:
+            sentences: Sentences to embed
+            
+        Returns:
+            float16 array of L2-normalized embeddings, one row per sentence
+        """
+        return self._encode(sentences).astype(np.float16, copy=False)
+    
     def detect_intent(self, text: str, title: str = "") -> Literal['service', 'product', 'blog', 'informational', 'commercial']:
         """
         Detect website intent based on content patterns.
@@ -61,13 +114,26 @@ class TopicAnalyzer:
         Returns:
             Detected intent type
         """
-        text_lower = (text + " " + title).lower()
+        # Title first, so it is always scored even when the scan stops early
+        text_lower = (title + " " + text).lower()
+        
+        # Count intent-related keywords in one pass (non-overlapping per
+        # keyword, same as str.count), checked for a clear winner every block
+        scores = [0] * len(self._intent_labels)
+        last_end = {}
+        next_check = INTENT_BLOCK_SIZE
+        for end, (keyword, indices) in self.intent_automaton.iter(text_lower):
+            if end >= next_check:
+                if self._intent_is_decided(scores):
+                    logger.debug(f"Intent decided after {next_check} of {len(text_lower)} chars")
+                    break
+                next_check = (end // INTENT_BLOCK_SIZE + 1) * INTENT_BLOCK_SIZE
+            if end - len(keyword) >= last_end.get(keyword, -1):
+                last_end[keyword] = end
+                for index in indices:
+                    scores[index] += 1
         
-        # Count intent-related keywords
-        intent_scores = {}
-        for intent, keywords in self.intent_patterns.items():
-            score = sum(text_lower.count(keyword) for keyword in keywords)
-            intent_scores[intent] = score
+        intent_scores = dict(zip(self._intent_labels, scores))
         
         # Get intent with highest score
         if max(intent_scores.values()) == 0:
@@ -78,6 +144,11 @@ class TopicAnalyzer:
         
         return detected_intent
     
+    def _intent_is_decided(self, scores: List[int]) -> bool:
+        """Check whether the top intent dominates the runner-up."""
+        top, runner_up = sorted(scores, reverse=True)[:2]
+        return top >= INTENT_MIN_SCORE and top > INTENT_DOMINANCE_RATIO * runner_up
+    
     def generate_summary(self, text: str, max_sentences: int = 3) -> str:
         """
         Generate a brief summary of the text.
@@ -90,16 +161,20 @@ class TopicAnalyzer:
         Returns:
             Summary text
         """
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        # Take the first sentences (usually most important), stopping as soon
+        # as enough have been found instead of splitting the whole text
+        # Can be enhanced with sentence scoring using embeddings
+        summary_sentences = []
+        for match in _SENT_ITER.finditer(text):
+            sentence = match.group().strip()
+            if len(sentence) > 20:
+                summary_sentences.append(sentence)
+                if len(summary_sentences) >= max_sentences:
+                    break
         
-        if not sentences:
+        if not summary_sentences:
             return ""
         
-        # Simple approach: take first few sentences (usually most important)
-        # Can be enhanced with sentence scoring using embeddings
-        summary_sentences = sentences[:max_sentences]
         summary = '. '.join(summary_sentences) + '.'
         
         logger.info(f"Generated summary: {len(summary)} chars")
@@ -118,7 +193,7 @@ class TopicAnalyzer:
             List of entities
         """
         # Extract capitalized words (likely proper nouns/entities)
-        words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
+        words = _ENTITY_RE.findall(text)
         
         # Count frequency
         entity_counts = Counter(words)
@@ -140,6 +215,13 @@ class TopicAnalyzer:
         Returns:
             Dictionary with analysis results
         """
+        cache_key = self._fingerprint(text, title, keywords)
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Topic analysis served from cache")
+            return {**cached, 'topics': list(cached['topics'])}
+        
         # Detect intent
         intent = self.detect_intent(text, title)
         
@@ -159,9 +241,37 @@ class TopicAnalyzer:
             'content_length': len(text)
         }
         
+        with self._analysis_cache_lock:
+            self._analysis_cache[cache_key] = {**result, 'topics': list(topics)}
+        
         logger.info(f"Topic analysis complete - Intent: {intent}, Topics: {len(topics)}")
         
         return result
+    
+    @staticmethod
+    def _fingerprint(text: str, title: str, keywords: List[str] = None) -> bytes:
+        """
+        Fingerprint analyze() inputs for the result cache.
+        
+        Args:
+            text: Input text
+            title: Page title
+            keywords: Pre-extracted keywords
+            
+        Returns:
+            128-bit blake2b digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (title, '\x00'.join(keywords or ()), text):
+            digest.update(part.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\x1f')
+        return digest.digest()
+
+
+@lru_cache(maxsize=1)
+def _get_topic_analyzer() -> TopicAnalyzer:
+    """Get the shared TopicAnalyzer instance (created on first use)."""
+    return TopicAnalyzer()
 
 
 # Convenience function
@@ -177,5 +287,5 @@ def analyze_topics(text: str, title: str = "", keywords: List[str] = None) -> Di
     Returns:
         Dictionary with analysis results
     """
-    analyzer = TopicAnalyzer()
+    analyzer = _get_topic_analyzer()
     return analyzer.analyze(text, title, keywords)
@@ -3,23 +3,52 @@ URL Validator Module
 Validates URL format and checks accessibility before processing.
 """
 
+import asyncio
 import logging
 import re
-from typing import Tuple
-from urllib.parse import urlparse
-import requests
+import threading
+from functools import lru_cache
+from typing import ClassVar, Dict, FrozenSet, Iterable, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+import httpx
+from cachetools import TTLCache
 from app.config import settings
+from app.core import address_guard
+from app.core.address_guard import BlockedURLError
+from app.core.http_client import stream_public, stream_public_async
 
 logger = logging.getLogger(__name__)
 
+# Common patterns to exclude (matched as substrings of the netloc)
+EXCLUDED_DOMAINS = frozenset(['localhost', '127.0.0.1', '0.0.0.0'])
+_EXCLUDED_RE = re.compile('|'.join(map(re.escape, EXCLUDED_DOMAINS)))
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
 
 class URLValidator:
-    """Validates and checks URL accessibility."""
+    """
+    Validates and checks URL accessibility.
+    
+    Thread-safe: __slots__ prevents new attributes and the configuration is
+    not reassigned after __init__. The mutable state is the validation cache,
+    guarded by its own lock, and the in-flight checks, which are only touched
+    from the event loop.
+    """
+    
+    __slots__ = ('timeout', '_validation_cache', '_cache_lock', '_inflight')
+    
+    excluded_domains: ClassVar[FrozenSet[str]] = EXCLUDED_DOMAINS
+    headers: ClassVar[Dict[str, str]] = REQUEST_HEADERS
     
     def __init__(self):
         self.timeout = settings.request_timeout
-        # Common patterns to exclude
-        self.excluded_domains = ['localhost', '127.0.0.1', '0.0.0.0']
+        # Successful validations by normalized URL, plus in-flight async checks
+        self._validation_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.url_validation_ttl)
+        self._cache_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def validate_url_format(self, url: str) -> Tuple[bool, str]:
         """
@@ -37,7 +66,7 @@ class URLValidator:
                 return False, "URL must be a non-empty string"
             
             # Parse URL
-            parsed = urlparse(str(url))
+            parsed = urlsplit(url)
             
             # Check scheme
             if parsed.scheme not in ['http', 'https']:
@@ -48,16 +77,65 @@ class URLValidator:
                 return False, "Invalid URL: missing domain"
             
             # Check for excluded domains (localhost, etc.)
-            if any(excluded in parsed.netloc.lower() for excluded in self.excluded_domains):
+            if _EXCLUDED_RE.search(parsed.netloc.lower()):
                 return False, f"Local URLs are not supported"
             
-            logger.info(f"URL format validation passed: {url}")
+            logger.info("URL format validation passed: %s", url)
             return True, ""
             
         except Exception as e:
-            logger.error(f"URL format validation error: {str(e)}")
+            logger.error("URL format validation error: %s", e)
             return False, f"Invalid URL format: {str(e)}"
     
+    def resolve_host(self, host: str) -> Tuple[str, ...]:
+        """
+        Resolve a hostname to its IP addresses (cached for a few minutes).
+        Blocking - use resolve_host_async from async code.
+        
+        Args:
+            host: Hostname or IP literal
+            
+        Returns:
+            Resolved IP address strings
+            
+        Raises:
+            socket.gaierror: If the hostname cannot be resolved
+        """
+        return address_guard.resolve_host(host)
+    
+    async def resolve_host_async(self, host: str) -> Tuple[str, ...]:
+        """Async variant of resolve_host (getaddrinfo runs in a worker thread)."""
+        return await address_guard.resolve_host_async(host)
+    
+    def check_public_addresses(self, addresses: Iterable[str]) -> Tuple[bool, str]:
+        """
+        Reject hosts resolving to private, loopback or otherwise non-public
+        addresses (SSRF protection).
+        
+        Args:
+            addresses: Resolved IP address strings
+            
+        Returns:
+            Tuple of (is_public, error_message)
+        """
+        return address_guard.check_public_addresses(addresses)
+    
+    def check_host(self, url: str) -> Tuple[bool, str]:
+        """
+        Resolve the URL host and make sure it is publicly routable.
+        
+        Args:
+            url: URL with a validated format
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        return address_guard.check_public_url(url)
+    
+    async def check_host_async(self, url: str) -> Tuple[bool, str]:
+        """Async variant of check_host."""
+        return await address_guard.check_public_url_async(url)
+    
     def check_accessibility(self, url: str) -> Tuple[bool, str, int]:
         """
         Check if URL is accessible via HTTP request.
@@ -69,38 +147,91 @@ class URLValidator:
             Tuple of (is_accessible, error_message, status_code)
         """
         try:
-            # Send HEAD request first (faster)
-            response = requests.head(
-                str(url),
-                timeout=self.timeout,
-                allow_redirects=True,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            
-            status_code = response.status_code
-            
-            # Check if successful (2xx or 3xx)
-            if 200 <= status_code < 400:
-                logger.info(f"URL accessible: {url} (Status: {status_code})")
-                return True, "", status_code
-            else:
-                return False, f"HTTP {status_code}: URL not accessible", status_code
+            # Streaming GET: only the headers are read, and servers that reject
+            # HEAD (405) are not misreported. Redirects are followed by hand and
+            # every hop must resolve to a public address
+            with stream_public(url, timeout=self.timeout, headers=self.headers) as response:
+                return self._accessibility_result(url, response.status_code)
                 
-        except requests.exceptions.Timeout:
+        except BlockedURLError as e:
+            return False, str(e), 0
+        except httpx.TimeoutException:
             return False, "Request timeout: URL took too long to respond", 0
-        except requests.exceptions.ConnectionError:
+        except httpx.TooManyRedirects:
+            return False, "Too many redirects", 0
+        except httpx.TransportError:
             return False, "Connection error: Unable to reach URL", 0
-        except requests.exceptions.TooManyRedirects:
+        except Exception as e:
+            logger.error("Accessibility check error: %s", e)
+            return False, f"Error checking URL: {str(e)}", 0
+    
+    async def check_accessibility_async(self, url: str) -> Tuple[bool, str, int]:
+        """
+        Async variant of check_accessibility.
+        Sends the probe request without blocking the event loop.
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            Tuple of (is_accessible, error_message, status_code)
+        """
+        try:
+            # Streaming GET (headers only); every redirect hop is checked
+            async with stream_public_async(url, timeout=self.timeout, headers=self.headers) as response:
+                return self._accessibility_result(url, response.status_code)
+            
+        except BlockedURLError as e:
+            return False, str(e), 0
+        except httpx.TimeoutException:
+            return False, "Request timeout: URL took too long to respond", 0
+        except httpx.TooManyRedirects:
             return False, "Too many redirects", 0
+        except httpx.TransportError:
+            return False, "Connection error: Unable to reach URL", 0
         except Exception as e:
-            logger.error(f"Accessibility check error: {str(e)}")
+            logger.error("Accessibility check error: %s", e)
             return False, f"Error checking URL: {str(e)}", 0
     
+    def _accessibility_result(self, url: str, status_code: int) -> Tuple[bool, str, int]:
+        """Interpret the probe response status code."""
+        # Check if successful (2xx or 3xx)
+        if 200 <= status_code < 400:
+            logger.info("URL accessible: %s (Status: %s)", url, status_code)
+            return True, "", status_code
+        else:
+            return False, f"HTTP {status_code}: URL not accessible", status_code
+    
+    def _cache_key(self, url: str) -> str:
+        """Normalize a URL for the validation cache (scheme and host are case-insensitive)."""
+        parsed = urlsplit(url)
+        return urlunsplit((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', parsed.query, ''))
+    
+    def _get_cached(self, key: str) -> Optional[Tuple[bool, str]]:
+        """Return a cached validation result, if still fresh."""
+        with self._cache_lock:
+            return self._validation_cache.get(key)
+    
+    def _set_cached(self, key: str, result: Tuple[bool, str]):
+        """Cache a successful validation (failures are re-checked on retry)."""
+        if result[0]:
+            with self._cache_lock:
+                self._validation_cache[key] = result
+    
+    def invalidate(self, url: str):
+        """
+        Drop a URL from the validation cache.
+        
+        Args:
+            url: URL to forget
+        """
+        with self._cache_lock:
+            self._validation_cache.pop(self._cache_key(url), None)
+    
     def validate(self, url: str) -> Tuple[bool, str]:
         """
-        Complete URL validation: format and accessibility.
+        Complete URL validation: format, resolved address and accessibility.
+        Successful results are cached for settings.url_validation_ttl seconds.
         
         Args:
             url: URL to validate
@@ -113,15 +244,84 @@ class URLValidator:
         if not is_valid_format:
             return False, format_error
         
-        # Step 2: Check accessibility
+        key = self._cache_key(url)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        result = self._validate_host_and_access(url)
+        self._set_cached(key, result)
+        return result
+    
+    def _validate_host_and_access(self, url: str) -> Tuple[bool, str]:
+        """Validate the resolved address and accessibility of a well-formed URL."""
+        # Step 2: Resolve the host and reject private/local addresses
+        is_public, host_error = self.check_host(url)
+        if not is_public:
+            return False, host_error
+        
+        # Step 3: Check accessibility
         is_accessible, access_error, status_code = self.check_accessibility(url)
         if not is_accessible:
             return False, access_error
         
-        logger.info(f"URL validation successful: {url}")
+        logger.info("URL validation successful: %s", url)
+        return True, ""
+    
+    async def validate_async(self, url: str) -> Tuple[bool, str]:
+        """
+        Async variant of validate.
+        Concurrent validations of the same URL share one in-flight check.
+        
+        Args:
+            url: URL to validate
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        # Step 1: Validate format
+        is_valid_format, format_error = self.validate_url_format(url)
+        if not is_valid_format:
+            return False, format_error
+        
+        key = self._cache_key(url)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._validate_host_and_access_async(url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded, so one cancelled caller does not cancel the shared check
+        result = await asyncio.shield(task)
+        self._set_cached(key, result)
+        return result
+    
+    async def _validate_host_and_access_async(self, url: str) -> Tuple[bool, str]:
+        """Async variant of _validate_host_and_access."""
+        # Step 2: Resolve the host (off the event loop) and reject private/local addresses
+        is_public, host_error = await self.check_host_async(url)
+        if not is_public:
+            return False, host_error
+        
+        # Step 3: Check accessibility
+        is_accessible, access_error, status_code = await self.check_accessibility_async(url)
+        if not is_accessible:
+            return False, access_error
+        
+        logger.info("URL validation successful: %s", url)
         return True, ""
 
 
+@lru_cache(maxsize=1)
+def _get_url_validator() -> URLValidator:
+    """Shared validator, so repeated calls reuse its validation cache."""
+    return URLValidator()
+
+
 # Convenience function
 def validate_url(url: str) -> Tuple[bool, str]:
     """
@@ -133,5 +333,5 @@ def validate_url(url: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    validator = URLValidator()
+    validator = _get_url_validator()
     return validator.validate(url)
@@ -3,16 +3,29 @@ FastAPI Application - Main Entry Point
 Orchestrates the complete blog generation pipeline.
 """
 
+import asyncio
+import hashlib
 import logging
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from cachetools import TTLCache
 
 from app.models import (
     BlogGenerationRequest,
     BlogGenerationResponse,
+    BatchBlogGenerationRequest,
+    BatchBlogGenerationResponse,
+    BlogJobSubmitResponse,
+    BlogJobStatus,
     ErrorResponse,
     KeywordData,
     ContentAnalysis,
@@ -29,6 +42,10 @@ from app.core.prompt_builder import PromptBuilder
 from app.core.blog_generator import BlogGenerator
 from app.core.seo_postprocessor import SEOPostProcessor
 from app.core.image_fetcher import ImageFetcher
+from app.core.http_client import close_http_clients
+from app.core.keyword_extractor import extract_keywords
+from app.core.topic_analyzer import analyze_topics
+from app.core.nlp_pool import create_nlp_pool
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +54,19 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     logger.info("Starting AI Blog Generator API...")
-    logger.info(f"Environment: {settings.app_env}")
-    logger.info(f"Gemini Model: {settings.gemini_model}")
+    logger.info("Environment: %s", settings.app_env)
+    logger.info("Gemini Model: %s", settings.gemini_model)
+    # Bounded pool for asyncio.to_thread, caps concurrent blocking/CPU-bound steps
+    executor = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix="pipeline")
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Optional worker processes for the NLP steps (each loads its own models)
+    app.state.nlp_pool = create_nlp_pool(settings.nlp_workers) if settings.nlp_workers > 0 else None
     yield
     logger.info("Shutting down AI Blog Generator API...")
+    await close_http_clients()
+    executor.shutdown(wait=False, cancel_futures=True)
+    if app.state.nlp_pool is not None:
+        app.state.nlp_pool.shutdown(wait=False, cancel_futures=True)
 
 
 # Initialize FastAPI app
@@ -48,7 +74,8 @@ app = FastAPI(
     title="AI Blog Generator API",
     description="Generate SEO-optimized blog posts from website URLs using AI",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -60,6 +87,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (full blogs) for clients sending Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Initialize components (singleton pattern for better performance)
 url_validator = URLValidator()
 content_extractor = ContentExtractor()
@@ -71,6 +101,96 @@ blog_generator = BlogGenerator()
 seo_postprocessor = SEOPostProcessor()
 image_fetcher = ImageFetcher()
 
+# Two-tier result cache (only touched from the event loop thread, so no locks):
+# L1 - finished responses per (url, tone, word_count)
+# L2 - cleaned text + keywords per extracted-content hash, skips cleaning/NLP
+_response_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.response_cache_ttl)
+_content_cache: TTLCache = TTLCache(maxsize=512, ttl=settings.response_cache_ttl)
+
+
+def _response_cache_key(url: str, request: BlogGenerationRequest) -> str:
+    """Cache key for a finished blog response."""
+    return hashlib.sha256(f"{url}|{request.tone}|{request.word_count}".encode('utf-8')).hexdigest()
+
+
+def _content_cache_key(text: str) -> str:
+    """Cache key for extracted page content."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Background generation jobs by id: {"task", "queue", "step"}. Running jobs
+# are held in a plain dict (so their tasks can never be evicted or garbage
+# collected mid-run) and move to the expiring cache once finished
+_running_jobs: Dict[str, dict] = {}
+_finished_jobs: TTLCache = TTLCache(maxsize=1024, ttl=settings.response_cache_ttl)
+_job_semaphore = asyncio.Semaphore(settings.job_concurrency)
+
+# Progress listener for the current pipeline run (set by streaming requests)
+_progress_queue: ContextVar[Optional[asyncio.Queue]] = ContextVar('progress_queue', default=None)
+
+
+def report_progress(step: str):
+    """
+    Log a pipeline step and forward it to the run's progress listener, if any.
+    
+    Args:
+        step: Human-readable step description
+    """
+    logger.info(step)
+    queue = _progress_queue.get()
+    if queue is not None:
+        queue.put_nowait(step)
+
+
+async def run_nlp_step(thread_func, process_func, *args):
+    """
+    Run a CPU-bound NLP step off the event loop.
+    Uses the NLP process pool when enabled (settings.nlp_workers), otherwise
+    a worker thread with the shared in-process components.
+    
+    Args:
+        thread_func: Bound method of a shared component (thread path)
+        process_func: Picklable module-level equivalent (process path)
+        *args: Positional arguments for the step
+        
+    Returns:
+        Result of the step
+    """
+    pool = getattr(app.state, 'nlp_pool', None)
+    if pool is not None:
+        return await asyncio.get_running_loop().run_in_executor(pool, process_func, *args)
+    return await asyncio.to_thread(thread_func, *args)
+
+
+async def fetch_blog_images(keywords: List[str]) -> Tuple[Optional[ImageData], List[ImageData]]:
+    """
+    Fetch featured and additional images (non-critical step).
+    
+    Args:
+        keywords: Primary keywords used as the search query
+        
+    Returns:
+        Tuple of (featured_image, additional_images)
+    """
+    featured_image = None
+    additional_images = []
+    
+    if not settings.unsplash_access_key:
+        logger.warning("Unsplash API key not configured - skipping image fetch")
+        return featured_image, additional_images
+    
+    try:
+        # One search request covers the featured image and the additional ones
+        images = await image_fetcher.fetch_batch_async(keywords, featured=True, additional=3)
+        if images['featured']:
+            featured_image = ImageData(**images['featured'])
+        additional_images = [ImageData(**img) for img in images['additional']]
+        logger.info("Fetched %s images successfully", len(additional_images))
+    except Exception as e:
+        logger.warning("Image fetching failed (non-critical): %s", e)
+    
+    return featured_image, additional_images
+
 
 @app.get("/")
 async def root():
@@ -112,7 +232,8 @@ async def generate_blog(request: BlogGenerationRequest):
     5. Topic analysis (local NLP)
     6. Prompt building
     7. Blog generation (LLM)
-    8. SEO post-processing
+    8. Image fetching (concurrent with steps 5-7)
+    9. SEO post-processing
     
     Args:
         request: BlogGenerationRequest with URL and parameters
@@ -124,90 +245,94 @@ async def generate_blog(request: BlogGenerationRequest):
     url = str(request.url)
     
     try:
-        logger.info(f"Starting blog generation for URL: {url}")
+        logger.info("Starting blog generation for URL: %s", url)
+        
+        response_key = _response_cache_key(url, request)
+        cached_response = _response_cache.get(response_key)
+        if cached_response is not None:
+            logger.info("Returning cached blog for URL")
+            return cached_response.model_copy(
+                update={'processing_time': round(time.time() - start_time, 2)}
+            )
         
         # Step 1: Validate URL
-        logger.info("Step 1/8: Validating URL...")
-        is_valid, error_msg = url_validator.validate(url)
+        report_progress("Step 1/9: Validating URL...")
+        is_valid, error_msg = await url_validator.validate_async(url)
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"URL validation failed: {error_msg}")
         
         # Step 2: Extract content
-        logger.info("Step 2/8: Extracting content...")
+        report_progress("Step 2/9: Extracting content...")
         try:
-            content_data = content_extractor.extract(url)
+            content_data = await content_extractor.extract_async(url)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Content extraction failed: {str(e)}")
         
-        # Step 3: Clean text
-        logger.info("Step 3/8: Cleaning text...")
-        cleaned_text = text_cleaner.clean(content_data['text'])
-        if not cleaned_text:
-            raise HTTPException(status_code=400, detail="No usable content found after cleaning")
-        
-        # Step 4: Extract keywords (local NLP)
-        logger.info("Step 4/8: Extracting keywords...")
-        keyword_data = keyword_extractor.extract_and_categorize(cleaned_text)
-        
-        # Step 5: Analyze topics (local NLP)
-        logger.info("Step 5/8: Analyzing topics...")
-        analysis_data = topic_analyzer.analyze(
-            cleaned_text,
-            title=content_data.get('title', ''),
-            keywords=keyword_data.get('primary_keywords', [])
-        )
-        
-        # Step 6: Build prompt
-        logger.info("Step 6/8: Building prompt...")
-        prompt = prompt_builder.build_prompt(
-            url=url,
-            title=content_data.get('title', ''),
-            summary=analysis_data['summary'],
-            intent=analysis_data['intent'],
-            primary_keywords=keyword_data['primary_keywords'],
-            secondary_keywords=keyword_data['secondary_keywords'],
-            topics=analysis_data['topics'],
-            tone=request.tone,
-            word_count=request.word_count
-        )
+        content_key = _content_cache_key(content_data['text'])
+        cached_content = _content_cache.get(content_key)
+        if cached_content is not None:
+            # Page content unchanged since a previous run - reuse steps 3 and 4
+            report_progress("Steps 3-4/9: Reusing cleaned text and keywords for unchanged content")
+            cleaned_text, keyword_data = cached_content
+        else:
+            # Step 3: Clean text
+            report_progress("Step 3/9: Cleaning text...")
+            cleaned_text = await asyncio.to_thread(text_cleaner.clean, content_data['text'])
+            if not cleaned_text:
+                raise HTTPException(status_code=400, detail="No usable content found after cleaning")
+            
+            # Step 4: Extract keywords (local NLP)
+            report_progress("Step 4/9: Extracting keywords...")
+            keyword_data = await run_nlp_step(
+                keyword_extractor.extract_and_categorize, extract_keywords, cleaned_text
+            )
+            _content_cache[content_key] = (cleaned_text, keyword_data)
         
-        # Step 7: Generate blog (LLM call)
-        logger.info("Step 7/9: Generating blog with LLM...")
+        # Step 8 (image fetching) only needs the keywords, so start it now and
+        # let it overlap topic analysis, prompt building and the LLM call
+        report_progress("Step 8/9: Fetching relevant images...")
+        image_task = asyncio.create_task(fetch_blog_images(keyword_data['primary_keywords']))
         try:
-            blog_data = blog_generator.generate(prompt)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Blog generation failed: {str(e)}")
-        
-        # Step 8: Fetch images
-        logger.info("Step 8/9: Fetching relevant images...")
-        featured_image = None
-        additional_images = []
-        
-        if settings.unsplash_access_key:
+            # Step 5: Analyze topics (local NLP)
+            report_progress("Step 5/9: Analyzing topics...")
+            analysis_data = await run_nlp_step(
+                topic_analyzer.analyze,
+                analyze_topics,
+                cleaned_text,
+                content_data.get('title', ''),
+                keyword_data.get('primary_keywords', [])
+            )
+            
+            # Step 6: Build prompt
+            report_progress("Step 6/9: Building prompt...")
+            prompt = prompt_builder.build_prompt(
+                url=url,
+                title=content_data.get('title', ''),
+                summary=analysis_data['summary'],
+                intent=analysis_data['intent'],
+                primary_keywords=keyword_data['primary_keywords'],
+                secondary_keywords=keyword_data['secondary_keywords'],
+                topics=analysis_data['topics'],
+                tone=request.tone,
+                word_count=request.word_count
+            )
+            
+            # Step 7: Generate blog (LLM call)
+            report_progress("Step 7/9: Generating blog with LLM...")
             try:
-                # Get featured image
-                featured_image_data = image_fetcher.get_featured_image(
-                    keywords=keyword_data['primary_keywords']
-                )
-                if featured_image_data:
-                    featured_image = ImageData(**featured_image_data)
-                
-                # Get additional images for sections
-                additional_images_data = image_fetcher.fetch_images(
-                    keywords=keyword_data['primary_keywords'],
-                    num_images=3
-                )
-                additional_images = [ImageData(**img) for img in additional_images_data]
-                logger.info(f"Fetched {len(additional_images)} images successfully")
+                blog_data = await blog_generator.generate_async(prompt)
             except Exception as e:
-                logger.warning(f"Image fetching failed (non-critical): {str(e)}")
-        else:
-            logger.warning("Unsplash API key not configured - skipping image fetch")
+                raise HTTPException(status_code=500, detail=f"Blog generation failed: {str(e)}")
+        except BaseException:
+            image_task.cancel()
+            raise
+        
+        featured_image, additional_images = await image_task
         
         # Step 9: SEO post-processing (if requested)
-        logger.info("Step 9/9: Post-processing for SEO...")
+        report_progress("Step 9/9: Post-processing for SEO...")
         all_keywords = keyword_data['primary_keywords'] + keyword_data['secondary_keywords']
-        processed_result = seo_postprocessor.process(blog_data, all_keywords)
+        processed_result = await asyncio.to_thread(seo_postprocessor.process, blog_data, all_keywords)
         
         # Add images to blog content
         processed_result['blog']['featured_image'] = featured_image
@@ -231,25 +356,239 @@ async def generate_blog(request: BlogGenerationRequest):
                 topics=analysis_data['topics'],
                 content_length=analysis_data['content_length']
             ),
-            word_count=processed_result['seo_analysis']['word_count'],
+            word_count=processed_result['seo_analysis'].word_count,
             processing_time=round(processing_time, 2)
         )
         
-        logger.info(f"Blog generation completed in {processing_time:.2f}s")
-        logger.info(f"SEO Score: {processed_result['seo_analysis']['seo_score']}/100")
+        _response_cache[response_key] = response
+        
+        logger.info("Blog generation completed in %.2fs", processing_time)
+        logger.info("SEO Score: %s/100", processed_result['seo_analysis'].seo_score)
         
         return response
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
 
+@app.post("/generate-blog-stream")
+async def generate_blog_stream(request: BlogGenerationRequest):
+    """
+    Generate a blog, streaming pipeline progress as newline-delimited JSON.
+    
+    Emits {"event": "progress", "step": ...} lines while the pipeline runs,
+    then a single {"event": "result", "data": ...} or
+    {"event": "error", "status_code": ..., "detail": ...} line.
+    
+    Args:
+        request: BlogGenerationRequest with URL and parameters
+        
+    Returns:
+        StreamingResponse of NDJSON events
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def run() -> BlogGenerationResponse:
+        _progress_queue.set(queue)
+        try:
+            return await generate_blog(request)
+        finally:
+            queue.put_nowait(None)
+    
+    task = asyncio.create_task(run())
+    
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            while (step := await queue.get()) is not None:
+                yield orjson.dumps({"event": "progress", "step": step}) + b"\n"
+            
+            try:
+                response = await task
+            except HTTPException as e:
+                event = {"event": "error", "status_code": e.status_code, "detail": e.detail}
+            else:
+                event = {"event": "result", "data": response.model_dump()}
+            yield orjson.dumps(event) + b"\n"
+        finally:
+            # Client went away mid-stream - stop the pipeline
+            task.cancel()
+    
+    # GZipMiddleware does not flush between chunks, which would hold progress
+    # lines back; an explicit Content-Encoding makes it pass the stream through
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"}
+    )
+
+
+@app.post(
+    "/generate-blog/submit",
+    response_model=BlogJobSubmitResponse,
+    status_code=202
+)
+async def submit_blog_job(request: BlogGenerationRequest):
+    """
+    Start a blog generation in the background and return its job ID at once.
+    Poll GET /generate-blog/{job_id} for progress and the result.
+    
+    Args:
+        request: BlogGenerationRequest with URL and parameters
+        
+    Returns:
+        BlogJobSubmitResponse with the job ID
+    """
+    if len(_running_jobs) >= settings.max_pending_jobs:
+        raise HTTPException(status_code=429, detail="Too many generation jobs in progress, try again later")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def run() -> BlogGenerationResponse:
+        _progress_queue.set(queue)
+        # Bounded like the batch path, so a burst of submits cannot run
+        # unbounded pipelines at once
+        async with _job_semaphore:
+            return await generate_blog(request)
+    
+    job_id = uuid.uuid4().hex
+    task = asyncio.create_task(run())
+    _running_jobs[job_id] = {"task": task, "queue": queue, "step": "Queued..."}
+    task.add_done_callback(lambda t: _finish_job(job_id, t))
+    logger.info("Submitted generation job %s for %s", job_id, request.url)
+    
+    return BlogJobSubmitResponse(job_id=job_id)
+
+
+def _finish_job(job_id: str, task: asyncio.Task):
+    """Move a finished job to the expiring cache and retrieve its outcome."""
+    _finished_jobs[job_id] = _running_jobs.pop(job_id)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and not isinstance(error, HTTPException):
+        logger.error("Generation job %s failed: %s", job_id, error)
+
+
+@app.get("/generate-blog/{job_id}", response_model=BlogJobStatus)
+async def get_blog_job(job_id: str):
+    """
+    Get the progress or result of a background generation job.
+    
+    Args:
+        job_id: ID returned by POST /generate-blog/submit
+        
+    Returns:
+        BlogJobStatus with the latest step, and the result or error once done
+    """
+    job = _running_jobs.get(job_id) or _finished_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    queue = job["queue"]
+    while not queue.empty():
+        job["step"] = queue.get_nowait()
+    
+    task = job["task"]
+    if not task.done():
+        return BlogJobStatus(job_id=job_id, done=False, step=job["step"])
+    
+    try:
+        result = task.result()
+    except HTTPException as e:
+        return BlogJobStatus(
+            job_id=job_id, done=True, step=job["step"],
+            status_code=e.status_code, detail=e.detail
+        )
+    except Exception as e:
+        return BlogJobStatus(
+            job_id=job_id, done=True, step=job["step"],
+            status_code=500, detail=str(e)
+        )
+    
+    return BlogJobStatus(job_id=job_id, done=True, step=job["step"], result=result)
+
+
+async def generate_blogs_batch(
+    requests: List[BlogGenerationRequest],
+    concurrency: int = 20
+) -> List[Union[BlogGenerationResponse, ErrorResponse]]:
+    """
+    Generate blogs for many URLs concurrently.
+    A semaphore bounds in-flight pipelines; Gemini calls are additionally
+    paced by the shared rate limiter.
+    
+    Args:
+        requests: One generation request per URL
+        concurrency: Maximum number of pipelines running at once
+        
+    Returns:
+        Generated blog or error for each request, in request order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run_one(request: BlogGenerationRequest) -> Union[BlogGenerationResponse, ErrorResponse]:
+        async with semaphore:
+            try:
+                return await generate_blog(request)
+            except HTTPException as e:
+                return ErrorResponse(
+                    success=False,
+                    error=e.detail,
+                    details=f"URL: {request.url} (status code: {e.status_code})"
+                )
+    
+    return await asyncio.gather(*(run_one(request) for request in requests))
+
+
+@app.post(
+    "/generate-blogs-batch",
+    response_model=BatchBlogGenerationResponse
+)
+async def generate_blogs_batch_endpoint(request: BatchBlogGenerationRequest):
+    """
+    Generate SEO-optimized blog posts for a list of URLs.
+    Each URL runs the full /generate-blog pipeline; failures are reported
+    per URL without failing the whole batch.
+    
+    Args:
+        request: BatchBlogGenerationRequest with URLs and shared parameters
+        
+    Returns:
+        BatchBlogGenerationResponse with per-URL results
+    """
+    start_time = time.time()
+    logger.info("Starting batch generation for %s URLs (concurrency: %s)",
+                len(request.urls), request.concurrency)
+    
+    results = await generate_blogs_batch(
+        [
+            BlogGenerationRequest(
+                url=url,
+                tone=request.tone,
+                word_count=request.word_count,
+                include_meta=request.include_meta
+            )
+            for url in request.urls
+        ],
+        concurrency=request.concurrency
+    )
+    
+    processing_time = time.time() - start_time
+    logger.info("Batch generation completed in %.2fs", processing_time)
+    
+    return BatchBlogGenerationResponse(
+        success=True,
+        results=results,
+        processing_time=round(processing_time, 2)
+    )
+
+
 @app.post("/estimate-cost")
 async def estimate_cost(url: str, word_count: int = 800):
     """
@@ -267,15 +606,14 @@ async def estimate_cost(url: str, word_count: int = 800):
         prompt_length = 2000  # Average prompt length
         output_length = word_count * 6  # Rough char estimate
         
-        generator = BlogGenerator()
-        estimated_cost = generator.estimate_cost(prompt_length, output_length)
+        estimated_cost = blog_generator.estimate_cost(prompt_length, output_length)
         
         return {
             "url": url,
             "word_count": word_count,
             "estimated_cost_usd": round(estimated_cost, 4),
             "provider": "Google Gemini",
-            "model": generator.model
+            "model": blog_generator.model
         }
         
     except Exception as e:
@@ -286,27 +624,27 @@ async def estimate_cost(url: str, word_count: int = 800):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             success=False,
             error=exc.detail,
             details=f"Status code: {exc.status_code}"
-        ).dict()
+        ).model_dump()
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             success=False,
             error="Internal server error",
             details=str(exc)
-        ).dict()
+        ).model_dump()
     )
 
 
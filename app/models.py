@@ -3,7 +3,7 @@ Pydantic models for API request/response validation.
 """
 
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Union
 from datetime import datetime
 
 
@@ -27,12 +27,43 @@ class BlogGenerationRequest(BaseModel):
     )
 
 
+class BatchBlogGenerationRequest(BaseModel):
+    """Request model for batch blog generation endpoint."""
+    
+    urls: List[HttpUrl] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Website URLs to generate blogs from (1-50)"
+    )
+    tone: Literal["professional", "casual", "technical", "conversational"] = Field(
+        default="professional",
+        description="Tone of the generated blogs"
+    )
+    word_count: int = Field(
+        default=800,
+        ge=300,
+        le=2000,
+        description="Target word count for each blog (300-2000)"
+    )
+    include_meta: bool = Field(
+        default=True,
+        description="Include meta description and SEO elements"
+    )
+    concurrency: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Maximum number of blogs generated in parallel (1-20)"
+    )
+
+
 class KeywordData(BaseModel):
     """Extracted keyword information."""
     
     primary_keywords: List[str] = Field(description="Main keywords (top 5)")
     secondary_keywords: List[str] = Field(description="Supporting keywords (top 10)")
-    keyword_density: dict = Field(description="Keyword frequency mapping")
+    keyword_density: Dict[str, float] = Field(description="Keyword frequency mapping")
 
 
 class ContentAnalysis(BaseModel):
@@ -63,14 +94,14 @@ class BlogContent(BaseModel):
     title: str = Field(description="Blog post title (H1)")
     meta_description: str = Field(description="SEO meta description (150-160 chars)")
     introduction: str = Field(description="Opening paragraph")
-    sections: List[dict] = Field(
+    sections: List[Dict[str, str]] = Field(
         description="List of sections with heading and content"
     )
     conclusion: str = Field(description="Closing paragraph")
     cta: str = Field(description="Call-to-action")
     tags: List[str] = Field(description="Suggested tags")
     featured_image: Optional[ImageData] = Field(default=None, description="Featured image for blog header")
-    additional_images: List[ImageData] = Field(default=[], description="Additional images for blog sections")
+    additional_images: List[ImageData] = Field(default_factory=list, description="Additional images for blog sections")
 
 
 class BlogGenerationResponse(BaseModel):
@@ -91,3 +122,30 @@ class ErrorResponse(BaseModel):
     success: bool = False
     error: str = Field(description="Error message")
     details: Optional[str] = Field(default=None, description="Additional error details")
+
+
+class BatchBlogGenerationResponse(BaseModel):
+    """Response model for batch blog generation (results in request order)."""
+    
+    success: bool = True
+    results: List[Union[BlogGenerationResponse, ErrorResponse]] = Field(
+        description="Per-URL generated blog or error"
+    )
+    processing_time: float = Field(description="Time taken in seconds")
+
+
+class BlogJobSubmitResponse(BaseModel):
+    """Response model for a submitted background generation job."""
+    
+    job_id: str = Field(description="ID to poll at GET /generate-blog/{job_id}")
+
+
+class BlogJobStatus(BaseModel):
+    """Status of a background generation job."""
+    
+    job_id: str
+    done: bool = Field(description="Whether the job has finished (successfully or not)")
+    step: Optional[str] = Field(default=None, description="Latest pipeline step reported")
+    result: Optional[BlogGenerationResponse] = Field(default=None, description="Generated blog once done")
+    status_code: Optional[int] = Field(default=None, description="HTTP status code if the job failed")
+    detail: Optional[str] = Field(default=None, description="Error message if the job failed")
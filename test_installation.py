@@ -3,6 +3,7 @@ Simple test script to verify the installation and basic functionality.
 Run this after installation to ensure everything is working.
 """
 
+import importlib.util
 import sys
 
 
@@ -70,16 +71,28 @@ def test_config():
 
 
 def test_models():
-    """Test if NLP models can be loaded."""
+    """Test if NLP models are available (without downloading or loading them)."""
     print("\nTesting NLP models...")
     
+    if importlib.util.find_spec('sentence_transformers') is None:
+        print("✗ SentenceTransformers not installed")
+        return False
+    
     try:
-        from sentence_transformers import SentenceTransformer
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("✓ Sentence Transformer model loaded")
+        from huggingface_hub import try_to_load_from_cache
+        from app.config import settings
+        
+        repo_id = settings.embedding_model
+        if '/' not in repo_id:
+            repo_id = f"sentence-transformers/{repo_id}"
+        
+        if isinstance(try_to_load_from_cache(repo_id, 'config.json'), str):
+            print(f"✓ Sentence Transformer model cached: {repo_id}")
+        else:
+            print(f"⚠ Sentence Transformer model not cached (will download on first use): {repo_id}")
         return True
     except Exception as e:
-        print(f"⚠ Could not load model (will download on first use): {str(e)}")
+        print(f"⚠ Could not check model cache (will download on first use): {str(e)}")
         return True  # Not critical, will download on first use
 
 
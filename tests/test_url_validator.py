@@ -0,0 +1,131 @@
+"""
+Tests for SSRF protection in URL validation and page fetching.
+DNS is faked and HTTP goes through httpx.MockTransport, so no network is used.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import httpcore
+import httpx
+import pytest
+from app.core import address_guard, http_client
+from app.core.address_guard import NON_PUBLIC_ERROR
+from app.core.content_extractor import ContentExtractor
+from app.core.url_validator import URLValidator
+
+FAKE_DNS = {
+    "public.example": "93.184.216.34",
+    "other-public.example": "93.184.216.35",
+    "internal.example": "10.1.2.3",
+    "rebind.example": "127.0.0.1",
+}
+
+METADATA_URL = "http://169.254.169.254/latest/meta-data/"
+
+
+@pytest.fixture(autouse=True)
+def fake_dns(monkeypatch):
+    """Resolve the FAKE_DNS hosts (and IP literals) without the network."""
+    def getaddrinfo(host, port, *args, **kwargs):
+        address = FAKE_DNS.get(host, host)
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        family = socket.AF_INET if ip.version == 4 else socket.AF_INET6
+        return [(family, socket.SOCK_STREAM, 6, "", (address, 0))]
+
+    monkeypatch.setattr(address_guard.socket, "getaddrinfo", getaddrinfo)
+    address_guard._dns_cache.clear()
+    yield
+    address_guard._dns_cache.clear()
+
+
+@pytest.fixture
+def requested_hosts(monkeypatch):
+    """
+    Route the public-only clients through a mock server and record every
+    host a request was sent to. The /redirect-* paths redirect to the cloud
+    metadata address, an internal host or another public host; anything
+    else serves a small HTML page.
+    """
+    hosts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        if request.url.path == "/redirect-private":
+            return httpx.Response(302, headers={"Location": METADATA_URL})
+        if request.url.path == "/redirect-internal":
+            return httpx.Response(301, headers={"Location": "http://internal.example/admin"})
+        if request.url.path == "/redirect-public":
+            return httpx.Response(302, headers={"Location": "http://other-public.example/article"})
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, text="<html><body><p>Hello</p></body></html>")
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        http_client, "get_public_http_client",
+        lambda: httpx.Client(transport=transport, follow_redirects=False)
+    )
+    monkeypatch.setattr(
+        http_client, "get_public_async_http_client",
+        lambda: httpx.AsyncClient(transport=transport, follow_redirects=False)
+    )
+    return hosts
+
+
+@pytest.mark.parametrize("url", [
+    "http://10.0.0.1/admin",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::ffff:192.168.1.1]/",
+])
+def test_rejects_private_ip_literal(url, requested_hosts):
+    validator = URLValidator()
+
+    assert validator.validate(url) == (False, NON_PUBLIC_ERROR)
+    assert asyncio.run(validator.validate_async(url)) == (False, NON_PUBLIC_ERROR)
+    assert requested_hosts == []
+
+
+def test_rejects_hostname_resolving_to_private_address(requested_hosts):
+    validator = URLValidator()
+
+    assert validator.validate("http://internal.example/") == (False, NON_PUBLIC_ERROR)
+    assert asyncio.run(validator.validate_async("http://internal.example/")) == (False, NON_PUBLIC_ERROR)
+    assert ContentExtractor()._fetch_html("http://internal.example/") is None
+    assert requested_hosts == []
+
+
+@pytest.mark.parametrize("path", ["/redirect-private", "/redirect-internal"])
+def test_rejects_redirect_to_private_address(path, requested_hosts):
+    url = f"http://public.example{path}"
+
+    assert URLValidator().validate(url) == (False, NON_PUBLIC_ERROR)
+    assert asyncio.run(URLValidator().validate_async(url)) == (False, NON_PUBLIC_ERROR)
+    assert ContentExtractor()._fetch_html(url) is None
+    assert asyncio.run(ContentExtractor()._fetch_html_async(url)) is None
+    # Only the first hop was ever requested
+    assert set(requested_hosts) == {"public.example"}
+
+
+def test_follows_redirect_to_public_address(requested_hosts):
+    url = "http://public.example/redirect-public"
+
+    assert URLValidator().validate(url) == (True, "")
+    assert b"Hello" in ContentExtractor()._fetch_html(url)
+    assert requested_hosts == ["public.example", "other-public.example"] * 2
+
+
+def test_public_backend_refuses_private_address_at_connect():
+    # The host resolves to loopback at connect time (e.g. DNS rebinding after
+    # validation), so the connection itself must be refused
+    with pytest.raises(httpcore.ConnectError):
+        http_client._PublicOnlyBackend().connect_tcp("rebind.example", 80)
+
+    with pytest.raises(httpcore.ConnectError):
+        asyncio.run(http_client._PublicOnlyAsyncBackend().connect_tcp("10.0.0.1", 80))
+
+
+def test_public_client_refuses_private_address():
+    with pytest.raises(httpx.ConnectError):
+        http_client.get_public_http_client().get("http://rebind.example:9/")
@@ -3,133 +3,232 @@ Gradio Frontend Interface - Simplified for compatibility.
 All images are embedded directly in HTML to avoid Gradio component issues.
 """
 
+import asyncio
+import html
+import re
+import time
+from itertools import islice
 import gradio as gr
-import requests
-from typing import Dict, Tuple
+import httpx
+import orjson
+from cachetools import TTLCache
+from jinja2 import Environment, BaseLoader, select_autoescape
+from typing import AsyncIterator, Dict, Tuple
 
 # API endpoint (adjust if running remotely)
 API_URL = "http://localhost:8000"
 
+# Cheap local check so obviously malformed input never reaches the API
+_URL_RE = re.compile(r"^https?://[^\s/$.?#].[^\s]*$", re.IGNORECASE)
 
-def format_blog_output(response: Dict, include_meta: bool) -> Tuple[str, str, str]:
-    """
-    Format blog response for display with all images embedded in HTML.
-    
-    Args:
-        response: API response dictionary
-        include_meta: Whether to include meta description
-        
-    Returns:
-        Tuple of (blog_html, keywords_text, analysis_text)
-    """
-    if not response.get('success', False):
-        error = response.get('error', 'Unknown error')
-        return f"<h3 style='color: red;'>Error: {error}</h3>", "", ""
-    
-    blog = response.get('blog', {})
-    keywords = response.get('keywords', {})
-    analysis = response.get('analysis', {})
-    
-    # Extract featured image
-    featured_image = blog.get('featured_image')
-    featured_html = ""
-    
-    if featured_image and featured_image.get('url'):
-        featured_url = featured_image.get('url') or featured_image.get('url_small', '')
-        photographer = featured_image.get('photographer', 'Unknown')
-        photographer_url = featured_image.get('photographer_url', '#')
-        alt_text = featured_image.get('alt_text', blog.get('title', 'Featured image'))
-        
-        featured_html = f'''
+# Generations run as server-side jobs; the UI polls for progress with short
+# requests instead of holding one connection open for the whole run
+JOB_POLL_INTERVAL = 1.5
+JOB_TIMEOUT = 180.0  # 3 minutes for complex pages
+
+# Shared keep-alive client for all API calls; handlers are async, so a
+# request waiting on the backend does not hold a worker thread
+CLIENT = httpx.AsyncClient(
+    base_url=API_URL,
+    http2=True,
+    timeout=15.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    headers={"User-Agent": "ai-blog-generator-ui"}
+)
+
+# Recent successful generations keyed by (url, tone, word_count), so repeat
+# clicks skip the LLM round-trip
+_blog_cache: TTLCache = TTLCache(maxsize=128, ttl=3600)
+
+# Cost estimates keyed by (url, word_count); the estimate is deterministic
+# over short windows, so repeat clicks skip the round-trip
+_cost_cache: TTLCache = TTLCache(maxsize=256, ttl=600)
+
+# Last healthy status check, so rapid refreshes skip the round-trip
+HEALTH_CACHE_TTL = 3.0
+_health_cache = {"t": float("-inf"), "v": ""}
+
+# Blog HTML, compiled once at import; all interpolated values are autoescaped
+_JINJA_ENV = Environment(loader=BaseLoader(), autoescape=select_autoescape(default_for_string=True))
+
+BLOG_TEMPLATE = _JINJA_ENV.from_string("""
+    <div style='font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px;'>
+        <h1 style='color: #2c3e50; font-size: 2em; margin-bottom: 10px;'>{{ title }}</h1>
+        {% if include_meta and meta_description %}
+        <div style="background: linear-gradient(135deg, #EEF2FF, #E0E7FF); padding: 18px; border-radius: 14px; margin: 22px 0; border-left: 5px solid #4F46E5;"><strong style="color: #4F46E5; font-size: 15px;">📝 Meta Description</strong><br/><em style="color: #1E293B; font-style: normal; font-size: 15px; line-height: 1.6; display: block; margin-top: 6px;">{{ meta_description }}</em></div>
+        {% endif %}
+        {% if featured %}
         <div style='text-align: center; margin: 25px 0;'>
             <img 
-                src="{featured_url}" 
-                alt="{alt_text}" 
+                src="{{ featured.url }}" 
+                alt="{{ featured.alt_text }}" 
                 loading="lazy"
                 style='max-width: 100%; height: auto; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);'
             />
             <p style='text-align: center; font-size: 12px; color: #666; margin-top: 8px;'>
-                Photo by <a href="{photographer_url}?utm_source=ai_blog&utm_medium=referral" target="_blank" style="color: #3498db;">{photographer}</a> 
+                Photo by <a href="{{ featured.photographer_url }}?utm_source=ai_blog&utm_medium=referral" target="_blank" style="color: #3498db;">{{ featured.photographer }}</a> 
                 on <a href="https://unsplash.com/?utm_source=ai_blog&utm_medium=referral" target="_blank" style="color: #3498db;">Unsplash</a>
             </p>
         </div>
-        '''
-    
-    # Format blog as HTML
-    blog_html = f"""
-    <div style='font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px;'>
-        <h1 style='color: #2c3e50; font-size: 2em; margin-bottom: 10px;'>{blog.get('title', 'Untitled')}</h1>
-        
-        {'<div style="background: linear-gradient(135deg, #EEF2FF, #E0E7FF); padding: 18px; border-radius: 14px; margin: 22px 0; border-left: 5px solid #4F46E5;"><strong style="color: #4F46E5; font-size: 15px;">📝 Meta Description</strong><br/><em style="color: #1E293B; font-style: normal; font-size: 15px; line-height: 1.6; display: block; margin-top: 6px;">' + blog.get('meta_description', '') + '</em></div>' if include_meta and blog.get('meta_description') else ''}
-        
-        {featured_html}
-        
+        {% endif %}
         <div style='margin: 20px 0;'>
             <h2 style='color: #34495e;'>Introduction</h2>
-            <p style='line-height: 1.8; color: #333;'>{blog.get('introduction', '')}</p>
+            <p style='line-height: 1.8; color: #333;'>{{ introduction }}</p>
         </div>
-    """
-    
-    # Add sections
-    for section in blog.get('sections', []):
-        blog_html += f"""
+        {% for section in sections %}
         <div style='margin: 25px 0;'>
-            <h2 style='color: #34495e;'>{section.get('heading', '')}</h2>
-            <p style='line-height: 1.8; color: #333;'>{section.get('content', '')}</p>
+            <h2 style='color: #34495e;'>{{ section.get('heading', '') }}</h2>
+            <p style='line-height: 1.8; color: #333;'>{{ section.get('content', '') }}</p>
         </div>
-        """
-    
-    # Add conclusion and CTA
-    blog_html += f"""
+        {% endfor %}
         <div style='margin: 20px 0;'>
             <h2 style='color: #34495e;'>Conclusion</h2>
-            <p style='line-height: 1.8; color: #333;'>{blog.get('conclusion', '')}</p>
+            <p style='line-height: 1.8; color: #333;'>{{ conclusion }}</p>
         </div>
         
         <div style='background: linear-gradient(135deg, #3498db, #2980b9); color: white; padding: 20px; border-radius: 10px; margin: 20px 0; text-align: center;'>
-            <strong style='font-size: 1.1em;'>{blog.get('cta', '')}</strong>
+            <strong style='font-size: 1.1em;'>{{ cta }}</strong>
         </div>
-    """
-    
-    # Add additional images gallery inline
-    additional_images = blog.get('additional_images', [])
-    if additional_images:
-        blog_html += """
+        {% if has_additional_images %}
         <div style='margin-top: 30px; padding-top: 20px; border-top: 2px solid #ecf0f1;'>
             <h3 style='color: #2c3e50;'>🖼️ Related Images</h3>
             <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-top: 15px;'>
-        """
-        
-        for img in additional_images[:4]:  # Limit to 4 images
-            img_url = img.get('url_small') or img.get('url', '')
-            alt_text = img.get('alt_text', 'Related image')
-            photographer = img.get('photographer', '')
-            photographer_url = img.get('photographer_url', '#')
-            
-            if img_url:
-                blog_html += f'''
+            {% for img in images %}
                 <div style='text-align: center;'>
-                    <img src="{img_url}" alt="{alt_text}" 
+                    <img src="{{ img.url }}" alt="{{ img.alt_text }}" 
                          loading="lazy"
                          style='width: 100%; height: 150px; object-fit: cover; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'
                     />
                     <p style='font-size: 11px; color: #888; margin-top: 5px;'>
-                        📷 <a href="{photographer_url}?utm_source=ai_blog&utm_medium=referral" target="_blank" style="color: #666;">{photographer}</a>
+                        📷 <a href="{{ img.photographer_url }}?utm_source=ai_blog&utm_medium=referral" target="_blank" style="color: #666;">{{ img.photographer }}</a>
                     </p>
                 </div>
-                '''
-        
-        blog_html += "</div></div>"
-    
-    # Add footer stats
-    blog_html += f"""
+            {% endfor %}
+            </div>
+        </div>
+        {% endif %}
         <div style='margin-top: 30px; padding-top: 20px; border-top: 2px solid #ecf0f1;'>
-            <p><strong>Tags:</strong> {', '.join(blog.get('tags', []))}</p>
-            <p><strong>Word Count:</strong> {response.get('word_count', 'N/A')} words</p>
-            <p><strong>Processing Time:</strong> {response.get('processing_time', 'N/A')}s</p>
+            <p><strong>Tags:</strong> {{ tags | join(', ') }}</p>
+            <p><strong>Word Count:</strong> {{ word_count }} words</p>
+            <p><strong>Processing Time:</strong> {{ processing_time }}s</p>
         </div>
     </div>
+""")
+
+
+# Static page text, defined once at import; Gradio ships it to the browser in
+# the page config rather than re-sending it on each event
+HEADER_MD = """
+# 🤖 AI Blog Generator
+
+Generate SEO-optimized blog posts from any website URL using AI.
+Images are automatically fetched from Unsplash with proper attribution.
+
+---
+"""
+
+TIPS_MD = """
+### ℹ️ Quick Tips
+
+**Tone Options:**
+- 🎯 **Professional** - Business, formal
+- 😊 **Casual** - Friendly, relaxed
+- 🔧 **Technical** - Detailed, in-depth
+- 💬 **Conversational** - Personal, engaging
+
+**Word Count Guide:**
+- Short: 300-500 words
+- Medium: 500-1000 words
+- Long: 1000-2000 words
+
+**Images:**
+- Featured image at top
+- Related images at bottom
+- All lazy-loaded for speed
+- Photographer attribution included
+"""
+
+STACK_MD = """
+---
+
+### 🛠️ Technical Stack
+
+| Component | Technology |
+|-----------|------------|
+| Backend | FastAPI + Python |
+| NLP | KeyBERT, SentenceTransformers |
+| LLM | Google Gemini (gemini-3-flash-preview) |
+| Images | Unsplash API (Free tier) |
+| Frontend | Gradio |
+
+---
+
+**Note:** Make sure the FastAPI server is running: `uvicorn app.main:app --reload`
+"""
+
+
+def format_blog_output(response: Dict, include_meta: bool) -> Tuple[str, str, str]:
+    """
+    Format blog response for display with all images embedded in HTML.
+    
+    Args:
+        response: API response dictionary
+        include_meta: Whether to include meta description
+        
+    Returns:
+        Tuple of (blog_html, keywords_text, analysis_text)
     """
+    if not response.get('success', False):
+        error = response.get('error', 'Unknown error')
+        return f"<h3 style='color: red;'>Error: {html.escape(str(error))}</h3>", "", ""
+    
+    blog = response.get('blog', {})
+    keywords = response.get('keywords', {})
+    analysis = response.get('analysis', {})
+    title = blog.get('title', 'Untitled')
+    additional_images = blog.get('additional_images', [])
+    
+    # Extract featured image
+    featured_image = blog.get('featured_image')
+    featured = None
+    featured_url = featured_image and (featured_image.get('url') or featured_image.get('url_small'))
+    
+    if featured_url:
+        featured = {
+            'url': featured_url,
+            'photographer': featured_image.get('photographer', 'Unknown'),
+            'photographer_url': featured_image.get('photographer_url', '#'),
+            'alt_text': featured_image.get('alt_text', blog.get('title', 'Featured image'))
+        }
+    
+    # Additional images gallery (limit to 4 images)
+    images = []
+    for img in additional_images[:4]:
+        img_url = img.get('url_small') or img.get('url', '')
+        if img_url:
+            images.append({
+                'url': img_url,
+                'alt_text': img.get('alt_text', 'Related image'),
+                'photographer': img.get('photographer', ''),
+                'photographer_url': img.get('photographer_url', '#')
+            })
+    
+    # Format blog as HTML (autoescaped, so LLM/Unsplash text cannot inject markup)
+    blog_html = BLOG_TEMPLATE.render(
+        title=title,
+        include_meta=include_meta,
+        meta_description=blog.get('meta_description', ''),
+        featured=featured,
+        introduction=blog.get('introduction', ''),
+        sections=blog.get('sections', []),
+        conclusion=blog.get('conclusion', ''),
+        cta=blog.get('cta', ''),
+        has_additional_images=bool(additional_images),
+        images=images,
+        tags=blog.get('tags', []),
+        word_count=response.get('word_count', 'N/A'),
+        processing_time=response.get('processing_time', 'N/A')
+    )
     
     # Format keywords
     primary_kw = keywords.get('primary_keywords', [])
@@ -143,18 +242,17 @@ def format_blog_output(response: Dict, include_meta: bool) -> Tuple[str, str, st
 {', '.join(secondary_kw) if secondary_kw else 'None extracted'}
 
 **Keyword Density:**
-"""
-    for kw, d in list(density.items())[:10]:
-        keywords_text += f"- {kw}: {d*100:.2f}%\n"
+""" + "".join(f"- {kw}: {d*100:.2f}%\n" for kw, d in islice(density.items(), 10))
     
     # Format analysis
+    topics = analysis.get('topics')
     analysis_text = f"""**Summary:**
 {analysis.get('summary', 'No summary available')}
 
 **Detected Intent:** {analysis.get('intent', 'N/A').upper()}
 
 **Main Topics:**
-{', '.join(analysis.get('topics', [])) if analysis.get('topics') else 'None detected'}
+{', '.join(topics) if topics else 'None detected'}
 
 **Content Length:** {analysis.get('content_length', 'N/A')} characters
 """
@@ -162,223 +260,328 @@ def format_blog_output(response: Dict, include_meta: bool) -> Tuple[str, str, st
     return blog_html, keywords_text, analysis_text
 
 
-def generate_blog(url: str, tone: str, word_count: int, include_meta: bool) -> Tuple[str, str, str]:
+def format_progress(step: str) -> str:
+    """Placeholder shown in the blog tab while the pipeline runs."""
+    return f"<p style='color: #4F46E5; text-align: center; padding: 40px;'>⏳ {step}</p>"
+
+
+def format_api_error(response: httpx.Response) -> str:
+    """
+    Error banner for a failed API call. The API reports the message in
+    'error' (ErrorResponse) or 'detail' (validation errors); proxies may
+    answer with a non-JSON body, which is shown as-is.
+    """
+    try:
+        body = orjson.loads(response.content)
+        error_detail = body.get('error') or body.get('detail') or response.text
+    except Exception:
+        error_detail = response.text
+    return f"<h3 style='color: red;'>❌ API Error ({response.status_code}): {html.escape(str(error_detail))}</h3>"
+
+
+async def _generate_blog_outputs(
+    url: str,
+    tone: str,
+    word_count: int,
+    include_meta: bool,
+    ignore_cache: bool = False
+) -> AsyncIterator[Tuple[str, str, str]]:
     """
-    Call API to generate blog post.
+    Submit a generation job to the API and poll it, showing pipeline progress.
+    Recent results for the same URL, tone and word count are reused unless
+    ignore_cache is set.
     
-    Returns:
+    Yields:
         Tuple of (blog_html, keywords_md, analysis_md)
     """
     if not url or not url.strip():
-        return "<h3 style='color: orange;'>⚠️ Please enter a URL</h3>", "", ""
+        yield "<h3 style='color: orange;'>⚠️ Please enter a URL</h3>", "", ""
+        return
+    if not _URL_RE.match(url.strip()):
+        yield "<h3 style='color: orange;'>⚠️ Please enter a valid http(s) URL</h3>", "", ""
+        return
+    
+    cache_key = (url.strip(), tone.lower(), int(word_count))
+    cached = None if ignore_cache else _blog_cache.get(cache_key)
+    if cached is not None:
+        yield format_blog_output(cached, include_meta)
+        return
+    
+    yield format_progress("Sending request..."), "", ""
     
     try:
-        # Call API
-        response = requests.post(
-            f"{API_URL}/generate-blog",
-            json={
+        # Submit returns a job ID at once; the pipeline runs server-side
+        response = await CLIENT.post(
+            "/generate-blog/submit",
+            content=orjson.dumps({
                 "url": url.strip(),
                 "tone": tone.lower(),
                 "word_count": int(word_count),
                 "include_images": True
-            },
-            timeout=180  # 3 minutes for complex pages
+            }),
+            headers={"Content-Type": "application/json"},
+            timeout=15
         )
+        if response.status_code != 202:
+            yield format_api_error(response), "", ""
+            return
+        job_id = orjson.loads(response.content)['job_id']
         
-        if response.status_code == 200:
-            data = response.json()
-            return format_blog_output(data, include_meta)
-        else:
+        deadline = time.monotonic() + JOB_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
             try:
-                error_detail = response.json().get('detail', response.text)
-            except Exception:
-                error_detail = response.text
-            return f"<h3 style='color: red;'>❌ API Error ({response.status_code}): {error_detail}</h3>", "", ""
+                status = await CLIENT.get(f"/generate-blog/{job_id}", timeout=5)
+            except httpx.TransportError:
+                # Transient disconnect or slow poll - the job keeps running
+                continue
+            if status.status_code != 200:
+                yield format_api_error(status), "", ""
+                return
+            
+            job = orjson.loads(status.content)
+            if not job['done']:
+                if job['step']:
+                    yield format_progress(job['step']), "", ""
+                continue
+            if job['result'] is None:
+                yield f"<h3 style='color: red;'>❌ API Error ({job['status_code']}): {html.escape(str(job['detail']))}</h3>", "", ""
+                return
+            _blog_cache[cache_key] = job['result']
+            yield format_blog_output(job['result'], include_meta)
+            return
+        
+        yield "<h3 style='color: orange;'>⏱️ Request timed out. The page might be too complex. Try again or use a simpler URL.</h3>", "", ""
             
-    except requests.exceptions.Timeout:
-        return "<h3 style='color: orange;'>⏱️ Request timed out. The page might be too complex. Try again or use a simpler URL.</h3>", "", ""
-    except requests.exceptions.ConnectionError:
-        return "<h3 style='color: red;'>🔌 Cannot connect to API server. Make sure it's running at http://localhost:8000</h3>", "", ""
+    except httpx.TimeoutException:
+        yield "<h3 style='color: orange;'>⏱️ Request timed out. The page might be too complex. Try again or use a simpler URL.</h3>", "", ""
+    except httpx.TransportError:
+        yield "<h3 style='color: red;'>🔌 Cannot connect to API server. Make sure it's running at http://localhost:8000</h3>", "", ""
     except Exception as e:
-        return f"<h3 style='color: red;'>❌ Error: {str(e)}</h3>", "", ""
+        yield f"<h3 style='color: red;'>❌ Error: {html.escape(str(e))}</h3>", "", ""
+
+
+async def _fetch_cost(url: str, word_count: int) -> Dict:
+    """
+    Fetch a cost estimate from the API, reusing recent results.
+    
+    Args:
+        url: Website URL (already stripped)
+        word_count: Target word count
+        
+    Returns:
+        Estimate dictionary from /estimate-cost
+        
+    Raises:
+        httpx.HTTPStatusError: If the API does not return 200
+    """
+    cache_key = (url, word_count)
+    cached = _cost_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    response = await CLIENT.post(
+        "/estimate-cost",
+        params={"url": url, "word_count": word_count},
+        timeout=15
+    )
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    _cost_cache[cache_key] = data
+    return data
 
 
-def estimate_cost(url: str, word_count: int) -> str:
+async def estimate_cost(url: str, word_count: int) -> str:
     """Estimate generation cost."""
     if not url or not url.strip():
         return "⚠️ Please enter a URL first"
+    if not _URL_RE.match(url.strip()):
+        return "⚠️ Please enter a valid http(s) URL"
     
     try:
-        response = requests.post(
-            f"{API_URL}/estimate-cost",
-            params={"url": url.strip(), "word_count": int(word_count)},
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return f"""### 💰 Cost Estimation
+        data = await _fetch_cost(url.strip(), int(word_count))
+    except httpx.HTTPStatusError:
+        return "❌ Could not estimate cost"
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+    
+    return f"""### 💰 Cost Estimation
 
 | Parameter | Value |
 |-----------|-------|
 | **Provider** | {data.get('provider', 'Gemini').upper()} |
 | **Model** | {data.get('model', 'N/A')} |
-| **Estimated Cost** | ${data.get('estimated_cost', 0):.4f} USD |
+| **Estimated Cost** | ${data.get('estimated_cost_usd', 0):.4f} USD |
 | **Word Count** | {data.get('word_count', word_count)} words |
 
 *Note: Actual cost may vary based on content complexity.*
 """
-        else:
-            return "❌ Could not estimate cost"
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
 
 
-def check_api_health() -> str:
-    """Check API server status."""
+async def generate_blog(
+    url: str,
+    tone: str,
+    word_count: int,
+    include_meta: bool,
+    ignore_cache: bool = False
+) -> AsyncIterator[Tuple]:
+    """
+    Generate a blog post, fetching the cost estimate alongside it.
+    The estimate is filled in as soon as it arrives (it is cached and cheap,
+    so usually before the first progress update).
+    
+    Yields:
+        Tuple of (blog_html, keywords_md, analysis_md, cost_md), with cost_md
+        left unchanged until the estimate is ready
+    """
+    cost_task = asyncio.create_task(estimate_cost(url, word_count))
+    cost_shown = False
+    
+    try:
+        async for outputs in _generate_blog_outputs(url, tone, word_count, include_meta, ignore_cache):
+            cost_shown = cost_task.done()
+            yield (*outputs, cost_task.result() if cost_shown else gr.update())
+        
+        if not cost_shown:
+            # Blog outputs are final already, only the estimate changes
+            yield gr.update(), gr.update(), gr.update(), await cost_task
+    finally:
+        cost_task.cancel()
+
+
+async def check_api_health() -> str:
+    """Check API server status (a healthy result is reused for a few seconds)."""
+    if time.monotonic() - _health_cache["t"] < HEALTH_CACHE_TTL:
+        return _health_cache["v"]
+    
     try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
+        response = await CLIENT.get("/health", timeout=5)
         if response.status_code == 200:
-            return "✅ API server is running"
+            _health_cache["t"] = time.monotonic()
+            _health_cache["v"] = "✅ API server is running"
+            return _health_cache["v"]
         return "⚠️ API server returned unexpected status"
     except Exception:
         return "❌ API server is not responding. Start it with: python -m uvicorn app.main:app --reload"
 
 
-# Build Gradio Interface
-with gr.Blocks(
-    title="AI Blog Generator",
-    theme=gr.themes.Soft(),
-    css="""
-    .main-title { text-align: center; margin-bottom: 20px; }
-    .status-box { padding: 10px; border-radius: 8px; margin: 10px 0; }
+def build_demo() -> gr.Blocks:
     """
-) as demo:
-    
-    gr.Markdown("""
-    # 🤖 AI Blog Generator
+    Build the Gradio interface.
+    Kept out of module import so importing the handlers stays cheap.
     
-    Generate SEO-optimized blog posts from any website URL using AI.
-    Images are automatically fetched from Unsplash with proper attribution.
-    
-    ---
-    """, elem_classes=["main-title"])
-    
-    # API Status
-    with gr.Row():
-        status_display = gr.Markdown(value=check_api_health())
-        refresh_btn = gr.Button("🔄 Check API", size="sm")
-    
-    refresh_btn.click(fn=check_api_health, outputs=status_display)
-    
-    gr.Markdown("---")
-    
-    with gr.Row():
-        with gr.Column(scale=2):
-            url_input = gr.Textbox(
-                label="Website URL",
-                placeholder="https://example.com/article",
-                info="Enter the URL of any webpage to generate a blog about"
-            )
-            
-            with gr.Row():
-                tone_input = gr.Dropdown(
-                    choices=["Professional", "Casual", "Technical", "Conversational"],
-                    value="Professional",
-                    label="Writing Tone"
+    Returns:
+        Blocks app, ready to queue and launch
+    """
+    with gr.Blocks(
+        title="AI Blog Generator",
+        theme=gr.themes.Soft(),
+        css="""
+        .main-title { text-align: center; margin-bottom: 20px; }
+        .status-box { padding: 10px; border-radius: 8px; margin: 10px 0; }
+        """
+    ) as demo:
+        
+        gr.Markdown(HEADER_MD, elem_classes=["main-title"])
+        
+        # API Status
+        with gr.Row():
+            status_display = gr.Markdown(value="⏳ Checking API server...")
+            refresh_btn = gr.Button("🔄 Check API", size="sm")
+        
+        # Checked on page load (async handlers cannot run while the UI is built)
+        demo.load(fn=check_api_health, outputs=status_display, concurrency_limit=None)
+        refresh_btn.click(fn=check_api_health, outputs=status_display, concurrency_limit=None)
+        
+        gr.Markdown("---")
+        
+        with gr.Row():
+            with gr.Column(scale=2):
+                url_input = gr.Textbox(
+                    label="Website URL",
+                    placeholder="https://example.com/article",
+                    info="Enter the URL of any webpage to generate a blog about"
                 )
-                word_count_input = gr.Slider(
-                    minimum=300,
-                    maximum=2000,
-                    value=800,
-                    step=100,
-                    label="Target Word Count"
+                
+                with gr.Row():
+                    tone_input = gr.Dropdown(
+                        choices=["Professional", "Casual", "Technical", "Conversational"],
+                        value="Professional",
+                        label="Writing Tone"
+                    )
+                    word_count_input = gr.Slider(
+                        minimum=300,
+                        maximum=2000,
+                        value=800,
+                        step=100,
+                        label="Target Word Count"
+                    )
+                
+                include_meta_input = gr.Checkbox(
+                    value=True,
+                    label="Include SEO Meta Description"
                 )
+                
+                ignore_cache_input = gr.Checkbox(
+                    value=False,
+                    label="Ignore cached result (force regeneration)"
+                )
+                
+                with gr.Row():
+                    generate_btn = gr.Button("🚀 Generate Blog", variant="primary", size="lg")
+                    estimate_btn = gr.Button("💰 Estimate Cost", variant="secondary")
             
-            include_meta_input = gr.Checkbox(
-                value=True,
-                label="Include SEO Meta Description"
-            )
-            
-            with gr.Row():
-                generate_btn = gr.Button("🚀 Generate Blog", variant="primary", size="lg")
-                estimate_btn = gr.Button("💰 Estimate Cost", variant="secondary")
+            with gr.Column(scale=1):
+                gr.Markdown(TIPS_MD)
+        
+        gr.Markdown("---")
         
-        with gr.Column(scale=1):
-            gr.Markdown("""
-            ### ℹ️ Quick Tips
+        with gr.Tabs():
+            with gr.TabItem("📝 Generated Blog"):
+                blog_output = gr.HTML(
+                    label="Blog Post",
+                    value="<p style='color: #888; text-align: center; padding: 40px;'>Your generated blog will appear here...</p>"
+                )
             
-            **Tone Options:**
-            - 🎯 **Professional** - Business, formal
-            - 😊 **Casual** - Friendly, relaxed
-            - 🔧 **Technical** - Detailed, in-depth
-            - 💬 **Conversational** - Personal, engaging
+            with gr.TabItem("🔑 Keywords & SEO"):
+                keywords_output = gr.Markdown(value="*Generate a blog to see keyword analysis*")
             
-            **Word Count Guide:**
-            - Short: 300-500 words
-            - Medium: 500-1000 words
-            - Long: 1000-2000 words
+            with gr.TabItem("📊 Content Analysis"):
+                analysis_output = gr.Markdown(value="*Generate a blog to see content analysis*")
             
-            **Images:**
-            - Featured image at top
-            - Related images at bottom
-            - All lazy-loaded for speed
-            - Photographer attribution included
-            """)
-    
-    gr.Markdown("---")
-    
-    with gr.Tabs():
-        with gr.TabItem("📝 Generated Blog"):
-            blog_output = gr.HTML(
-                label="Blog Post",
-                value="<p style='color: #888; text-align: center; padding: 40px;'>Your generated blog will appear here...</p>"
-            )
+            with gr.TabItem("💵 Cost Estimate"):
+                cost_output = gr.Markdown(value="*Click 'Estimate Cost' to see pricing*")
         
-        with gr.TabItem("🔑 Keywords & SEO"):
-            keywords_output = gr.Markdown(value="*Generate a blog to see keyword analysis*")
+        # Event handlers - plain HTML/Markdown outputs only (no Gallery or State)
+        generate_btn.click(
+            fn=generate_blog,
+            inputs=[url_input, tone_input, word_count_input, include_meta_input, ignore_cache_input],
+            outputs=[blog_output, keywords_output, analysis_output, cost_output],
+            # Long LLM generations get their own slots so they cannot starve
+            # the cheap handlers below
+            concurrency_limit=4,
+            concurrency_id="llm_gen"
+        )
         
-        with gr.TabItem("📊 Content Analysis"):
-            analysis_output = gr.Markdown(value="*Generate a blog to see content analysis*")
+        estimate_btn.click(
+            fn=estimate_cost,
+            inputs=[url_input, word_count_input],
+            outputs=cost_output,
+            concurrency_limit=None
+        )
         
-        with gr.TabItem("💵 Cost Estimate"):
-            cost_output = gr.Markdown(value="*Click 'Estimate Cost' to see pricing*")
-    
-    # Event handlers - simplified outputs (just 3 items, no Gallery or State)
-    generate_btn.click(
-        fn=generate_blog,
-        inputs=[url_input, tone_input, word_count_input, include_meta_input],
-        outputs=[blog_output, keywords_output, analysis_output]
-    )
-    
-    estimate_btn.click(
-        fn=estimate_cost,
-        inputs=[url_input, word_count_input],
-        outputs=cost_output
-    )
-    
-    gr.Markdown("""
-    ---
-    
-    ### 🛠️ Technical Stack
-    
-    | Component | Technology |
-    |-----------|------------|
-    | Backend | FastAPI + Python |
-    | NLP | KeyBERT, SentenceTransformers |
-    | LLM | Google Gemini (gemini-3-flash-preview) |
-    | Images | Unsplash API (Free tier) |
-    | Frontend | Gradio |
-    
-    ---
+        gr.Markdown(STACK_MD)
     
-    **Note:** Make sure the FastAPI server is running: `uvicorn app.main:app --reload`
-    """)
+    return demo
 
 
 if __name__ == "__main__":
     print("Starting Gradio UI...")
     print("Make sure the FastAPI backend is running at http://localhost:8000")
+    demo = build_demo()
+    # Bounded queue sheds excess load; api_open=False keeps REST callers
+    # from bypassing it
+    demo.queue(default_concurrency_limit=8, max_size=64, api_open=False)
     demo.launch(
         server_name="127.0.0.1",
         server_port=7860,